@@ -1,28 +1,163 @@
 """Command-line interface for SlideForge."""
 
+import os
+import re
+import functools
 import sys
-import argparse
+import threading
 from pathlib import Path
-import time
+from types import SimpleNamespace
+from importlib.util import find_spec
+from typing import List, Optional
 
 from version import __version__, __author__, __description__
 from config import load_config, show_config, set_config_value
-from utils.dependencies import check_and_install_dependencies
-from utils.file_utils import get_html_files, create_template_slide
-from converters import (
-    convert_to_pdf_playwright,
-    convert_to_ppt_playwright,
-    convert_to_pdf_weasyprint,
-    convert_to_ppt_weasyprint,
-)
-
-
-def parse_arguments():
-    """Parse command-line arguments."""
-    parser = argparse.ArgumentParser(
-        description='Convert HTML slides to PPT or PDF using different methods',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+from utils.console import is_interactive, prompt, use_block_buffered_stdout
+from utils.file_utils import get_html_files, scan_html_files, create_template_slide, delete_files
+
+
+# File extension written for each output format
+OUTPUT_EXTENSIONS = {'pdf': '.pdf', 'ppt': '.pptx'}
+
+# Relative --slides-dir/--output-dir values are resolved against src/
+_SCRIPT_DIR = Path(__file__).parent.resolve()
+
+# One --range part: "3" or "1-5", surrounding whitespace allowed
+_RANGE_RE = re.compile(r'\s*(\d+)\s*(?:-\s*(\d+)\s*)?$')
+
+# Methods whose sequential converters render in their own process pool
+# and take a workers= argument
+_POOLED_METHODS = {'weasyprint'}
+
+# Banner rule used around section headers
+_SEP = '=' * 60
+
+# Serializes progress output from concurrent batch-mode conversions
+_print_lock = threading.Lock()
+
+
+def _resolve_dir(path: str) -> Path:
+    """Resolve a directory argument against src/, skipping realpath for absolute paths."""
+    path = Path(path)
+    if path.is_absolute():
+        return path
+    return (_SCRIPT_DIR / path).resolve()
+
+
+FORMAT_CHOICES = ('pdf', 'ppt', 'png')
+CONVERT_FROM_CHOICES = ('pdf', 'ppt')
+METHOD_CHOICES = ('playwright', 'weasyprint')
+
+# Option table for the hand-rolled parser:
+# (option strings, dest, value type, choices). A type of bool marks a flag.
+_OPTIONS = [
+    (('--format', '-f'), 'format', str, FORMAT_CHOICES),
+    (('--convert-from', '-C'), 'convert_from', str, CONVERT_FROM_CHOICES),
+    (('--input', '-i'), 'input', str, None),
+    (('--method', '-m'), 'method', str, METHOD_CHOICES),
+    (('-o', '--output'), 'output', str, None),
+    (('--slides-dir', '-s'), 'slides_dir', str, None),
+    (('--output-dir', '-d'), 'output_dir', str, None),
+    (('--clean', '-c'), 'clean', bool, None),
+    (('--yes', '-y'), 'yes', bool, None),
+    (('--force-delete',), 'force_delete', bool, None),
+    (('--num-slides',), 'num_slides', int, None),
+    (('--list', '-l'), 'list', bool, None),
+    (('--dry-run', '-n'), 'dry_run', bool, None),
+    (('--version', '-V'), 'version', bool, None),
+    (('--range', '-r'), 'range', str, None),
+    (('--quiet', '-q'), 'quiet', bool, None),
+    (('--verbose', '-v'), 'verbose', bool, None),
+    (('--batch', '-b'), 'batch', bool, None),
+    (('--show-config',), 'show_config', bool, None),
+    (('--watch', '-w'), 'watch', bool, None),
+    (('--dimensions',), 'dimensions', str, None),
+    (('--merge-pdf',), 'merge_pdf', str, None),
+    (('--parallel', '-p'), 'parallel', bool, None),
+    (('--workers', '--jobs', '-j'), 'workers', int, None),
+    (('--batch-size',), 'batch_size', int, None),
+    (('--buffered',), 'buffered', bool, None),
+    (('--unbuffered',), 'unbuffered', bool, None),
+]
+
+# option string -> (display name, dest, type, choices)
+_OPTION_LOOKUP = {
+    option: ('/'.join(options), dest, value_type, choices)
+    for options, dest, value_type, choices in _OPTIONS
+    for option in options
+}
+
+_DEFAULTS = {dest: (False if value_type is bool else None) for _, dest, value_type, _ in _OPTIONS}
+_DEFAULTS.update({
+    'format_arg': None,
+    'set_config': None,
+    'slides_dir': '../slides',
+    'output_dir': '../output',
+    'workers': 4,
+    'batch_size': 1000,
+})
+
+HELP_TEXT = """\
+usage: {prog} [options] [{{pdf,ppt,png}}]
+
+Convert HTML slides to PPT or PDF using different methods
+
+positional arguments:
+  {{pdf,ppt,png}}         Output format: pdf, ppt, or png (can be used without
+                        --format)
+
+options:
+  -h, --help            show this help message and exit
+  --format, -f {{pdf,ppt,png}}
+                        Output format: pdf, ppt, or png
+  --convert-from, -C {{pdf,ppt}}
+                        Convert from existing PDF or PPT file (use with
+                        --input and --format)
+  --input, -i INPUT     Input file for format conversion (PDF or PPT)
+  --method, -m {{playwright,weasyprint}}
+                        Conversion method (default: playwright or from config)
+  -o, --output OUTPUT   Output filename (default: slides.pdf or slides.pptx)
+  --slides-dir, -s SLIDES_DIR
+                        Directory containing HTML slides (default: ../slides)
+  --output-dir, -d OUTPUT_DIR
+                        Output directory (default: ../output)
+  --clean, -c           Delete all HTML files in slides directory (requires
+                        confirmation)
+  --yes, -y             Answer yes to prompts (create templates, install
+                        dependencies)
+  --force-delete        With --yes, let --clean delete slides without
+                        confirmation
+  --num-slides NUM_SLIDES
+                        Number of template slides to create when none exist
+  --list, -l            List all HTML slides in the slides directory
+  --dry-run, -n         Show what would be converted without actually
+                        converting
+  --version, -V         Show version information
+  --range, -r RANGE     Convert only specific slides (e.g., 1-5, 1,3,5 or
+                        1-3,7-9)
+  --quiet, -q           Minimal output (quiet mode)
+  --verbose, -v         Detailed output (verbose mode)
+  --batch, -b           Convert to both PDF and PPT formats
+  --show-config         Show current configuration
+  --set-config KEY VALUE
+                        Set a configuration value (e.g., --set-config method
+                        playwright)
+  --watch, -w           Watch slides directory and auto-convert on changes
+  --dimensions DIMENSIONS
+                        Custom slide dimensions (e.g., 1920x1080)
+  --merge-pdf MERGE_PDF
+                        Merge with another PDF file
+  --parallel, -p        Use parallel processing for faster conversion
+  --workers, --jobs, -j WORKERS
+                        Number of parallel workers (default: 4, never more
+                        than the CPU count; Playwright uses at most 8)
+  --batch-size BATCH_SIZE
+                        Maximum slides handed to one parallel worker task
+                        (default: 1000)
+  --buffered            Block-buffer output (default when stdout is not a
+                        terminal)
+  --unbuffered          Write output immediately, even when piped
+
 Methods:
   1. playwright  - Best quality, requires browser (default)
   2. weasyprint  - Pure Python, no browser needed
@@ -34,190 +169,167 @@ Examples:
   ./slideforge.sh -f pdf -m weasyprint      # Short aliases
   ./slideforge.sh pdf -o my-slides          # Combined
   ./slideforge.sh --clean                   # Delete all slides
-        """
-    )
-    
-    parser.add_argument(
-        'format_arg',
-        nargs='?',
-        choices=['pdf', 'ppt', 'png'],
-        help='Output format: pdf, ppt, or png (can be used without --format)'
-    )
-    
-    parser.add_argument(
-        '--format', '-f',
-        choices=['pdf', 'ppt', 'png'],
-        required=False,
-        help='Output format: pdf, ppt, or png'
-    )
-    
-    parser.add_argument(
-        '--convert-from', '-C',
-        choices=['pdf', 'ppt'],
-        help='Convert from existing PDF or PPT file (use with --input and --format)'
-    )
-    
-    parser.add_argument(
-        '--input', '-i',
-        help='Input file for format conversion (PDF or PPT)',
-        default=None
-    )
-    
-    parser.add_argument(
-        '--method', '-m',
-        choices=['playwright', 'weasyprint'],
-        default=None,  # None means not specified, will use config or fallback
-        help='Conversion method (default: playwright or from config)'
-    )
-    
-    parser.add_argument(
-        '-o', '--output',
-        help='Output filename (default: slides.pdf or slides.pptx)',
-        default=None
-    )
-    
-    parser.add_argument(
-        '--slides-dir', '-s',
-        help='Directory containing HTML slides (default: ../slides)',
-        default='../slides'
-    )
-    
-    parser.add_argument(
-        '--output-dir', '-d',
-        help='Output directory (default: ../output)',
-        default='../output'
-    )
-    
-    parser.add_argument(
-        '--clean', '-c',
-        action='store_true',
-        help='Delete all HTML files in slides directory (requires confirmation)'
-    )
-    
-    parser.add_argument(
-        '--list', '-l',
-        action='store_true',
-        help='List all HTML slides in the slides directory'
-    )
-    
-    parser.add_argument(
-        '--dry-run', '-n',
-        action='store_true',
-        help='Show what would be converted without actually converting'
-    )
-    
-    parser.add_argument(
-        '--version', '-V',
-        action='store_true',
-        help='Show version information'
-    )
-    
-    parser.add_argument(
-        '--range', '-r',
-        help='Convert only specific slides (e.g., 1-5 or 1,3,5)',
-        default=None
-    )
-    
-    parser.add_argument(
-        '--quiet', '-q',
-        action='store_true',
-        help='Minimal output (quiet mode)'
-    )
-    
-    parser.add_argument(
-        '--verbose', '-v',
-        action='store_true',
-        help='Detailed output (verbose mode)'
-    )
-    
-    parser.add_argument(
-        '--batch', '-b',
-        action='store_true',
-        help='Convert to both PDF and PPT formats'
-    )
-    
-    parser.add_argument(
-        '--show-config',
-        action='store_true',
-        help='Show current configuration'
-    )
-    
-    parser.add_argument(
-        '--set-config',
-        nargs=2,
-        metavar=('KEY', 'VALUE'),
-        help='Set a configuration value (e.g., --set-config method playwright)'
-    )
-    
-    parser.add_argument(
-        '--watch', '-w',
-        action='store_true',
-        help='Watch slides directory and auto-convert on changes'
-    )
-    
-    parser.add_argument(
-        '--dimensions',
-        help='Custom slide dimensions (e.g., 1920x1080)',
-        default=None
-    )
-    
-    parser.add_argument(
-        '--merge-pdf',
-        help='Merge with another PDF file',
-        default=None
-    )
-    
-    parser.add_argument(
-        '--parallel', '-p',
-        action='store_true',
-        help='Use parallel processing for faster conversion'
-    )
-    
-    parser.add_argument(
-        '--workers',
-        type=int,
-        default=4,
-        help='Number of parallel workers (default: 4)'
-    )
-    
-    return parser.parse_args()
-
-
-def handle_missing_slides(slides_dir: Path):
+"""
+
+
+def format_help() -> str:
+    """Get the command-line help text."""
+    return HELP_TEXT.format(prog=os.path.basename(sys.argv[0]))
+
+
+def _parse_error(message: str):
+    """Report a command-line error the way argparse did and exit with status 2."""
+    prog = os.path.basename(sys.argv[0])
+    sys.stderr.write(f"usage: {prog} [options] [{{pdf,ppt,png}}]\n{prog}: error: {message}\n")
+    sys.exit(2)
+
+
+def _convert_value(name: str, value: str, value_type, choices):
+    """Convert and validate a single option value."""
+    if value_type is int:
+        try:
+            value = int(value)
+        except ValueError:
+            _parse_error(f"argument {name}: invalid int value: '{value}'")
+    
+    if choices is not None and value not in choices:
+        options = ', '.join(f"'{choice}'" for choice in choices)
+        _parse_error(f"argument {name}: invalid choice: '{value}' (choose from {options})")
+    
+    return value
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> SimpleNamespace:
+    """Parse command-line arguments.
+    
+    A small scanner over the _OPTIONS table instead of argparse, returning
+    a namespace with the same attributes argparse produced.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    values = dict(_DEFAULTS)
+    positionals = []
+    
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        
+        if arg in ('-h', '--help'):
+            sys.stdout.write(format_help())
+            sys.exit(0)
+        
+        if arg == '--':
+            positionals.extend(argv[i:])
+            break
+        
+        if not arg.startswith('-') or arg == '-':
+            positionals.append(arg)
+            continue
+        
+        # Split --option=value and -oVALUE forms
+        if arg.startswith('--'):
+            option, has_value, attached = arg.partition('=')
+        else:
+            option, attached = arg[:2], arg[2:]
+            has_value = bool(attached)
+        
+        if option == '--set-config':
+            if has_value or i + 2 > len(argv):
+                _parse_error("argument --set-config: expected 2 arguments")
+            values['set_config'] = (argv[i], argv[i + 1])
+            i += 2
+            continue
+        
+        if option not in _OPTION_LOOKUP:
+            _parse_error(f"unrecognized arguments: {arg}")
+        
+        name, dest, value_type, choices = _OPTION_LOOKUP[option]
+        
+        if value_type is bool:
+            # Short flags may be bundled: -pq
+            flags = [option] + (['-' + char for char in attached] if not arg.startswith('--') else [])
+            if arg.startswith('--') and has_value:
+                _parse_error(f"argument {name}: ignored explicit argument '{attached}'")
+            for flag in flags:
+                if flag not in _OPTION_LOOKUP or _OPTION_LOOKUP[flag][2] is not bool:
+                    _parse_error(f"argument {name}: ignored explicit argument '{attached}'")
+                values[_OPTION_LOOKUP[flag][1]] = True
+            continue
+        
+        if not has_value:
+            if i >= len(argv) or (argv[i].startswith('-') and argv[i] != '-'):
+                _parse_error(f"argument {name}: expected one argument")
+            attached = argv[i]
+            i += 1
+        
+        values[dest] = _convert_value(name, attached, value_type, choices)
+    
+    if len(positionals) > 1:
+        _parse_error(f"unrecognized arguments: {' '.join(positionals[1:])}")
+    if positionals:
+        values['format_arg'] = _convert_value('format_arg', positionals[0], str, FORMAT_CHOICES)
+    
+    return SimpleNamespace(**values)
+
+
+def handle_missing_slides(slides_dir: Path, assume_yes: bool = False, num_slides: Optional[int] = None):
     """Handle missing or empty slides directory."""
     if not slides_dir.exists():
         print(f"\nSlides directory not found: {slides_dir}")
     else:
         print(f"\nNo HTML files found in: {slides_dir}")
     
-    response = input("\nWould you like to create template HTML slides? (y/n): ").strip().lower()
-    
-    if response != 'y':
-        print("Operation cancelled.")
-        sys.exit(1)
+    if not assume_yes:
+        # Never block on a prompt nobody can answer (CI, pipes, cron)
+        if not is_interactive():
+            print("Error: stdin is not interactive, cannot ask to create templates")
+            print("Use --yes --num-slides N to create template slides non-interactively")
+            sys.exit(1)
+        
+        response = prompt("\nWould you like to create template HTML slides? (y/n): ").strip().lower()
+        
+        if response != 'y':
+            print("Operation cancelled.")
+            sys.exit(1)
     
     # Ask how many slides
-    while True:
-        try:
-            num_slides = int(input("How many HTML slides do you need? "))
-            if num_slides > 0:
-                break
-            print("Please enter a positive number.")
-        except ValueError:
-            print("Please enter a valid number.")
+    if num_slides is None:
+        if not is_interactive():
+            print("Error: --num-slides N is required when stdin is not interactive")
+            sys.exit(1)
+        
+        while True:
+            try:
+                num_slides = int(prompt("How many HTML slides do you need? "))
+                if num_slides > 0:
+                    break
+                print("Please enter a positive number.")
+            except ValueError:
+                print("Please enter a valid number.")
+    elif num_slides <= 0:
+        print("Error: --num-slides must be a positive number")
+        sys.exit(1)
     
     # Create slides directory if it doesn't exist
     slides_dir.mkdir(parents=True, exist_ok=True)
     
-    # Create template HTML files
+    # Create template HTML files (threads overlap the file writes)
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
     print(f"\nCreating {num_slides} template HTML slides...")
     created_count = 0
-    for i in range(1, num_slides + 1):
-        try:
-            create_template_slide(slides_dir / f"page{i}.html", i)
-            created_count += 1
-        except Exception as e:
-            print(f"Failed to create slide {i}: {e}")
+    max_workers = min(num_slides, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(create_template_slide, slides_dir / f"page{i}.html", i): i
+            for i in range(1, num_slides + 1)
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                created_count += 1
+            except Exception as e:
+                print(f"Failed to create slide {futures[future]}: {e}")
     
     if created_count == 0:
         print("Error: Failed to create any template slides")
@@ -228,130 +340,194 @@ def handle_missing_slides(slides_dir: Path):
     sys.exit(0)
 
 
+def _has_ext(filename: str, ext: str) -> bool:
+    """Check a filename's extension, lowercasing only the suffix."""
+    return os.path.splitext(filename)[1].lower() == ext
+
+
 def prepare_output_path(args, output_dir: Path) -> Path:
     """Prepare and validate output path."""
+    # Non-PDF HTML conversions go through the PowerPoint converters
+    ext = OUTPUT_EXTENSIONS.get(args.format, '.pptx')
+    
     # Determine output filename
     if args.output:
         output_filename = args.output
         # Add extension if missing
-        if args.format == 'pdf':
-            if not output_filename.lower().endswith('.pdf'):
-                output_filename += '.pdf'
-        else:  # ppt
-            if not output_filename.lower().endswith('.pptx'):
-                output_filename += '.pptx'
+        if not _has_ext(output_filename, ext):
+            output_filename += ext
     else:
-        output_filename = f"slides.pptx" if args.format == 'ppt' else "slides.pdf"
+        output_filename = 'slides' + ext
     
     output_path = output_dir / output_filename
     
     return output_path
 
 
-def run_conversion(args, html_files, output_path: Path):
-    """Execute the conversion based on format and method."""
+def get_converter(fmt: str, method: str):
+    """Get the sequential converter function for a format and method."""
+    # Importing the attribute from the converters package loads only that backend
+    import converters
+    
+    kind = 'pdf' if fmt == 'pdf' else 'ppt'
+    return getattr(converters, f"convert_to_{kind}_{method}")
+
+
+def _convert_one(args, html_files, output_path: Path, fmt: str, jobs: int, batch_size: int):
+    """Convert the deck to a single format."""
+    if args.batch and not args.quiet:
+        print(f"\n{_SEP}\nConverting to {fmt.upper()}...\n{_SEP}\n")
+    
+    # Adjust output path for current format
+    if args.batch:
+        ext = OUTPUT_EXTENSIONS[fmt]
+        current_output = output_path.parent / (output_path.stem + ext)
+    else:
+        current_output = output_path
+    
+    # Convert with parallel processing if enabled
+    if args.parallel and args.method == 'playwright':
+        from converters.parallel_converter import (
+            parallel_convert_to_pdf_playwright,
+            parallel_convert_to_ppt_playwright
+        )
+        
+        if fmt == 'pdf':
+            parallel_convert_to_pdf_playwright(html_files, current_output, jobs, args.quiet)
+        else:  # ppt
+            parallel_convert_to_ppt_playwright(html_files, current_output, jobs, args.quiet)
+    elif args.parallel and fmt == 'pdf':
+        # Other backends: shard the deck across processes, merge partial PDFs
+        from converters.parallel_converter import sharded_convert_to_pdf
+        
+        sharded_convert_to_pdf(args.method, html_files, current_output, jobs, args.quiet, batch_size)
+    else:
+        # Standard sequential conversion (import only the selected backend)
+        converter = get_converter(fmt, args.method)
+        if args.method in _POOLED_METHODS:
+            converter(html_files, current_output, workers=jobs)
+        else:
+            converter(html_files, current_output)
+    
+    if not args.quiet and not args.parallel:
+        print(f"\n✓ {fmt.upper()} saved to: {current_output}")
+
+
+def _convert_one_tagged(args, html_files, output_path: Path, fmt: str, jobs: int, batch_size: int):
+    """Run _convert_one in a batch thread, tagging its output lines with the format."""
+    sys.stdout.set_prefix(f"[{fmt.upper()}] ")
+    try:
+        _convert_one(args, html_files, output_path, fmt, jobs, batch_size)
+    finally:
+        sys.stdout.finish()
+
+
+def run_conversion(args, html_files, output_path: Path, jobs: Optional[int] = None, batch_size: Optional[int] = None):
+    """Execute the conversion based on format and method.
+    
+    jobs and batch_size default to --workers and --batch-size.
+    """
+    jobs = jobs or args.workers
+    batch_size = batch_size or args.batch_size
     formats_to_convert = ['pdf', 'ppt'] if args.batch else [args.format]
     
+    # Batch mode: run PDF and PPT side by side. Not with --parallel or a
+    # pooled backend: those already use every allowed core, and forking a
+    # process pool while another thread holds locks can deadlock the child
+    if args.batch and not args.parallel and args.method not in _POOLED_METHODS:
+        from concurrent.futures import ThreadPoolExecutor
+        from utils.console import LinePrefixingStdout
+        
+        # Both converters print progress (and errors before sys.exit);
+        # route it through one lock as whole lines tagged [PDF] / [PPT]
+        stdout = sys.stdout
+        sys.stdout = LinePrefixingStdout(stdout, _print_lock)
+        try:
+            with ThreadPoolExecutor(max_workers=len(formats_to_convert)) as executor:
+                futures = [
+                    executor.submit(_convert_one_tagged, args, html_files, output_path, fmt, jobs, batch_size)
+                    for fmt in formats_to_convert
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            sys.stdout = stdout
+        return
+    
     for fmt in formats_to_convert:
-        if args.batch and not args.quiet:
-            print(f"\n{'='*60}")
-            print(f"Converting to {fmt.upper()}...")
-            print(f"{'='*60}\n")
-        
-        # Adjust output path for current format
-        if args.batch:
-            ext = '.pptx' if fmt == 'ppt' else '.pdf'
-            current_output = output_path.parent / (output_path.stem + ext)
-        else:
-            current_output = output_path
-        
-        # Convert with parallel processing if enabled
-        if args.parallel and args.method == 'playwright':
-            from converters.parallel_converter import (
-                parallel_convert_to_pdf_playwright,
-                parallel_convert_to_ppt_playwright
-            )
-            
-            if fmt == 'pdf':
-                parallel_convert_to_pdf_playwright(html_files, str(current_output), args.workers, args.quiet)
-            else:  # ppt
-                parallel_convert_to_ppt_playwright(html_files, str(current_output), args.workers, args.quiet)
-        else:
-            # Standard sequential conversion
-            if fmt == 'pdf':
-                if args.method == 'playwright':
-                    convert_to_pdf_playwright(html_files, str(current_output))
-                elif args.method == 'weasyprint':
-                    convert_to_pdf_weasyprint(html_files, str(current_output))
-            else:  # ppt
-                if args.method == 'playwright':
-                    convert_to_ppt_playwright(html_files, str(current_output))
-                elif args.method == 'weasyprint':
-                    convert_to_ppt_weasyprint(html_files, str(current_output))
-        
-        if not args.quiet and not args.parallel:
-            print(f"\n✓ {fmt.upper()} saved to: {current_output}")
-
-
-def clean_slides_directory(slides_dir: Path):
-    """Delete all HTML files in slides directory with double confirmation."""
+        _convert_one(args, html_files, output_path, fmt, jobs, batch_size)
+
+
+def clean_slides_directory(slides_dir: Path, html_files: Optional[List[Path]] = None, assume_yes: bool = False):
+    """Delete all HTML files in slides directory with double confirmation.
+    
+    assume_yes skips both confirmations; callers only set it when the user
+    passed both --yes and --force-delete.
+    """
     if not slides_dir.exists():
         print(f"Slides directory not found: {slides_dir}")
         return
     
-    html_files = get_html_files(str(slides_dir))
+    if html_files is None:
+        # One scandir pass; unlink takes the entry path directly
+        scanned = scan_html_files(slides_dir)
+        names = [name for name, _, _ in scanned]
+        paths = [path for _, _, path in scanned]
+    else:
+        names = [file.name for file in html_files]
+        paths = html_files
     
-    if not html_files:
+    if not paths:
         print(f"No HTML files found in {slides_dir}")
         return
     
-    print(f"\n{'='*60}")
-    print("⚠️  WARNING: DELETE ALL SLIDES")
-    print(f"{'='*60}")
-    print(f"\nThis will permanently delete {len(html_files)} HTML file(s) from:")
+    print(f"\n{_SEP}\n⚠️  WARNING: DELETE ALL SLIDES\n{_SEP}")
+    print(f"\nThis will permanently delete {len(paths)} HTML file(s) from:")
     print(f"  {slides_dir}")
     print("\nFiles to be deleted:")
-    for i, file in enumerate(html_files[:10], 1):  # Show first 10
-        print(f"  {i}. {file.name}")
-    if len(html_files) > 10:
-        print(f"  ... and {len(html_files) - 10} more files")
-    
-    print(f"\n{'='*60}")
-    response1 = input("Are you sure you want to delete ALL slides? (yes/no): ").strip().lower()
-    
-    if response1 != 'yes':
-        print("Operation cancelled.")
-        return
-    
-    print(f"\n{'='*60}")
-    print("⚠️  FINAL CONFIRMATION")
-    print(f"{'='*60}")
-    response2 = input(f"Type 'DELETE' to confirm deletion of {len(html_files)} files: ").strip()
-    
-    if response2 != 'DELETE':
-        print("Operation cancelled.")
-        return
+    preview = [f"  {i}. {name}" for i, name in enumerate(names[:10], 1)]  # Show first 10
+    sys.stdout.write("\n".join(preview) + "\n")
+    if len(paths) > 10:
+        print(f"  ... and {len(paths) - 10} more files")
+    
+    print(f"\n{_SEP}")
+    
+    if not assume_yes:
+        if not is_interactive():
+            print("Error: stdin is not interactive, cannot confirm deletion")
+            print("Use --yes --force-delete to delete without confirmation")
+            return
+        
+        response1 = prompt("Are you sure you want to delete ALL slides? (yes/no): ").strip().lower()
+        
+        if response1 != 'yes':
+            print("Operation cancelled.")
+            return
+        
+        print(f"\n{_SEP}\n⚠️  FINAL CONFIRMATION\n{_SEP}")
+        response2 = prompt(f"Type 'DELETE' to confirm deletion of {len(paths)} files: ").strip()
+        
+        if response2 != 'DELETE':
+            print("Operation cancelled.")
+            return
     
     # Delete files
-    print(f"\n🗑️  Deleting {len(html_files)} HTML files...")
-    deleted_count = 0
-    failed_count = 0
+    print(f"\n🗑️  Deleting {len(paths)} HTML files...")
     
-    for html_file in html_files:
-        try:
-            html_file.unlink()
-            deleted_count += 1
-        except Exception as e:
-            print(f"  Failed to delete {html_file.name}: {e}")
-            failed_count += 1
+    errors = delete_files(paths)
+    
+    # Collect failures and report them in one write after the batch
+    failures = [(name, error) for name, error in zip(names, errors) if error is not None]
+    deleted_count = len(paths) - len(failures)
+    failed_count = len(failures)
+    if failures:
+        print("\n".join(f"  Failed to delete {name}: {error}" for name, error in failures))
     
     print(f"\n✓ Deleted {deleted_count} file(s)")
     if failed_count > 0:
         print(f"⚠ Failed to delete {failed_count} file(s)")
     
-    print(f"\n{'='*60}")
-    print("Slides directory cleaned successfully!")
-    print(f"{'='*60}\n")
+    print(f"\n{_SEP}\nSlides directory cleaned successfully!\n{_SEP}\n")
 
 
 def show_version():
@@ -362,60 +538,56 @@ def show_version():
     print(f"GitHub: https://github.com/blackspider-ops/SlideForge\n")
 
 
-def list_slides(slides_dir: Path):
-    """List all HTML slides in the directory."""
+def list_slides(slides_dir: Path, html_files: Optional[List[Path]] = None):
+    """List all HTML slides in the directory (pass html_files to reuse a scan)."""
     if not slides_dir.exists():
         print(f"Slides directory not found: {slides_dir}")
         return
     
-    html_files = get_html_files(str(slides_dir))
+    if html_files is None:
+        slides = [(name, size) for name, size, _ in scan_html_files(slides_dir)]
+    else:
+        slides = [(file.name, file.stat().st_size) for file in html_files]
     
-    if not html_files:
+    if not slides:
         print(f"No HTML files found in {slides_dir}")
         return
     
-    print(f"\n{'='*60}")
-    print(f"Found {len(html_files)} HTML slide(s) in {slides_dir}")
-    print(f"{'='*60}\n")
+    print(f"\n{_SEP}\nFound {len(slides)} HTML slide(s) in {slides_dir}\n{_SEP}\n")
     
-    for i, file in enumerate(html_files, 1):
-        size = file.stat().st_size / 1024  # KB
-        print(f"  {i:2d}. {file.name:<30} ({size:.1f} KB)")
+    # One write for the whole listing instead of a print per slide
+    lines = [f"  {i:2d}. {name:<30} ({size / 1024:.1f} KB)" for i, (name, size) in enumerate(slides, 1)]
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    print(f"\n{'='*60}\n")
+    print(f"\n{_SEP}\n")
 
 
 def parse_range(range_str: str, total_slides: int) -> list:
-    """Parse range string into list of indices."""
-    indices = []
-    
-    try:
-        # Handle comma-separated values: 1,3,5
-        if ',' in range_str:
-            for part in range_str.split(','):
-                idx = int(part.strip()) - 1  # Convert to 0-based
-                if 0 <= idx < total_slides:
-                    indices.append(idx)
-        # Handle range: 1-5
-        elif '-' in range_str:
-            start, end = range_str.split('-')
-            start_idx = int(start.strip()) - 1
-            end_idx = int(end.strip())
-            indices = list(range(max(0, start_idx), min(end_idx, total_slides)))
-        # Handle single number: 3
-        else:
-            idx = int(range_str.strip()) - 1
-            if 0 <= idx < total_slides:
-                indices.append(idx)
-    except ValueError:
-        print(f"Invalid range format: {range_str}")
-        print("Use formats like: 1-5, 1,3,5, or 3")
-        sys.exit(1)
+    """Parse range string into a sorted list of unique 0-based indices.
+    
+    Accepts single numbers, ranges and any comma-separated mix of the two
+    (e.g. 3, 1-5, 1,3,5, 1-3,5,7-9). Duplicates are collapsed so no slide
+    is rendered twice.
+    """
+    indices = set()
+    
+    for part in range_str.split(','):
+        # Single number (3) or range (1-5), matched in one pass
+        match = _RANGE_RE.match(part)
+        if not match:
+            print(f"Invalid range format: {range_str}")
+            print("Use formats like: 1-5, 1,3,5, 1-3,7-9, or 3")
+            sys.exit(1)
+        
+        start, end = match.groups()
+        start_idx = int(start) - 1  # Convert to 0-based
+        end_idx = int(end) if end else start_idx + 1
+        indices.update(range(max(0, start_idx), min(end_idx, total_slides)))
     
-    return indices
+    return sorted(indices)
 
 
-def watch_directory(slides_dir: Path, args):
+def watch_directory(slides_dir: Path, output_dir: Path, args):
     """Watch slides directory for changes and auto-convert."""
     try:
         from watchdog.observers import Observer
@@ -425,64 +597,68 @@ def watch_directory(slides_dir: Path, args):
         print("Install with: pip install watchdog")
         sys.exit(1)
     
+    # Everything that doesn't depend on the event is resolved once
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = prepare_output_path(args, output_dir)
+    convert = get_converter(args.format, args.method)
+    if args.method in _POOLED_METHODS:
+        convert = functools.partial(convert, workers=args.workers)
+    
     class SlideHandler(FileSystemEventHandler):
-        def __init__(self):
-            self.last_modified = {}
+        def __init__(self, output_path: Path, convert):
+            self.output_path = output_path
+            self.convert = convert
+            
+            self._timer = None
+            self._lock = threading.Lock()
+            self._convert_lock = threading.Lock()
+            self._changed = None
         
         def on_modified(self, event):
             if event.is_directory or not event.src_path.endswith('.html'):
                 return
             
-            # Debounce - ignore if modified within last 2 seconds
-            now = time.time()
-            if event.src_path in self.last_modified:
-                if now - self.last_modified[event.src_path] < 2:
-                    return
-            
-            self.last_modified[event.src_path] = now
+            # Debounce - restart a single timer so a burst of saves converts once
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._changed = event.src_path
+                self._timer = threading.Timer(0.5, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+        
+        def _run(self):
+            with self._lock:
+                changed = self._changed
             
             if not args.quiet:
-                print(f"\n🔄 Detected change: {Path(event.src_path).name}")
+                print(f"\n🔄 Detected change: {os.path.basename(changed)}")
                 print("Converting...")
             
-            # Trigger conversion
+            # Trigger conversion (one at a time if a save lands mid-conversion)
             try:
-                html_files = get_html_files(str(slides_dir))
-                output_dir = (slides_dir.parent / args.output_dir).resolve()
-                output_dir.mkdir(parents=True, exist_ok=True)
-                
-                output_filename = f"slides.{args.format}x" if args.format == 'ppt' else "slides.pdf"
-                output_path = output_dir / output_filename
-                
-                if args.format == 'pdf':
-                    if args.method == 'playwright':
-                        convert_to_pdf_playwright(html_files, str(output_path))
-                    else:
-                        convert_to_pdf_weasyprint(html_files, str(output_path))
-                else:
-                    if args.method == 'playwright':
-                        convert_to_ppt_playwright(html_files, str(output_path))
-                    else:
-                        convert_to_ppt_weasyprint(html_files, str(output_path))
+                with self._convert_lock:
+                    self.convert(get_html_files(slides_dir), self.output_path)
                 
                 if not args.quiet:
-                    print(f"✓ Converted to {output_path}")
+                    print(f"✓ Converted to {self.output_path}")
             except Exception as e:
                 print(f"❌ Conversion failed: {e}")
     
-    event_handler = SlideHandler()
+    event_handler = SlideHandler(output_path, convert)
     observer = Observer()
     observer.schedule(event_handler, str(slides_dir), recursive=False)
     observer.start()
     
-    print(f"\n{'='*60}")
-    print(f"👀 Watching {slides_dir} for changes...")
-    print("Press Ctrl+C to stop")
-    print(f"{'='*60}\n")
+    print(f"\n{_SEP}\n👀 Watching {slides_dir} for changes...\nPress Ctrl+C to stop\n{_SEP}\n")
     
+    # Block without polling; nothing sets the event and Ctrl+C still
+    # interrupts, except on Windows where an untimed wait ignores it
+    stop = threading.Event()
+    timeout = 1 if sys.platform == 'win32' else None
     try:
-        while True:
-            time.sleep(1)
+        while not stop.wait(timeout):
+            pass
     except KeyboardInterrupt:
         observer.stop()
         print("\n\n⚠ Watch mode stopped")
@@ -492,8 +668,19 @@ def watch_directory(slides_dir: Path, args):
 
 def run_converter():
     """Main converter logic."""
+    # Fast path: --version needs neither argument parsing nor config
+    argv = sys.argv[1:]
+    if '--version' in argv or '-V' in argv:
+        show_version()
+        sys.exit(0)
+    
     args = parse_arguments()
     
+    # Piped/redirected output: batch writes instead of one per line
+    # (not in long-running watch mode, where each line should show up)
+    if args.buffered or (not args.unbuffered and not args.watch and not sys.stdout.isatty()):
+        use_block_buffered_stdout()
+    
     # Smart format detection - use positional arg if provided
     if args.format_arg:
         args.format = args.format_arg
@@ -527,9 +714,9 @@ def run_converter():
         show_version()
         sys.exit(0)
     
-    # Get script directory
-    script_dir = Path(__file__).parent
-    slides_dir = (script_dir / args.slides_dir).resolve()
+    # Resolve working directories once for the whole run
+    slides_dir = _resolve_dir(args.slides_dir)
+    output_dir = _resolve_dir(args.output_dir)
     
     # Handle list command
     if args.list:
@@ -538,7 +725,7 @@ def run_converter():
     
     # Handle clean command
     if args.clean:
-        clean_slides_directory(slides_dir)
+        clean_slides_directory(slides_dir, assume_yes=args.yes and args.force_delete)
         sys.exit(0)
     
     # Handle format conversion (PDF ↔ PPT)
@@ -551,32 +738,31 @@ def run_converter():
             print("Error: --convert-from requires --format (target format)")
             sys.exit(1)
         
-        # Check format conversion dependencies
-        missing = []
-        try:
-            import reportlab
-        except ImportError:
-            missing.append("reportlab")
-        
-        if args.convert_from == 'pdf':
-            try:
-                import pdf2image
-            except ImportError:
-                missing.append("pdf2image")
+        # Check format conversion dependencies (find_spec doesn't run the package)
+        required = ['reportlab', 'pdf2image'] if args.convert_from == 'pdf' else ['reportlab']
+        missing = [pkg for pkg in required if find_spec(pkg) is None]
         
         if missing:
-            print(f"\n{'='*60}")
-            print("Missing dependencies for format conversion!")
-            print(f"{'='*60}\n")
+            print(f"\n{_SEP}\nMissing dependencies for format conversion!\n{_SEP}\n")
             for pkg in missing:
                 print(f"  - {pkg}")
-            print(f"\n{'='*60}")
-            response = input("Install missing dependencies? (y/n): ").strip().lower()
+            print(f"\n{_SEP}")
+            if args.yes:
+                response = 'y'
+            elif is_interactive():
+                response = prompt("Install missing dependencies? (y/n): ").strip().lower()
+            else:
+                print("stdin is not interactive; use --yes to install automatically")
+                response = 'n'
             if response == 'y':
                 import subprocess
-                for pkg in missing:
-                    print(f"Installing {pkg}...")
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
+                # One pip run resolves and installs everything together
+                print(f"Installing: {', '.join(missing)}...")
+                sys.stdout.flush()
+                subprocess.check_call([
+                    sys.executable, "-m", "pip", "install",
+                    "--quiet", "--disable-pip-version-check", *missing
+                ])
                 print("✓ Dependencies installed!\n")
             else:
                 sys.exit(1)
@@ -589,16 +775,14 @@ def run_converter():
             sys.exit(1)
         
         # Determine output path
-        output_dir = (script_dir / args.output_dir).resolve()
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        ext = OUTPUT_EXTENSIONS.get(args.format, '.pdf')
         if args.output:
             output_filename = args.output
-            ext = '.pptx' if args.format == 'ppt' else '.pdf'
-            if not output_filename.lower().endswith(ext):
+            if not _has_ext(output_filename, ext):
                 output_filename += ext
         else:
-            ext = '.pptx' if args.format == 'ppt' else '.pdf'
             output_filename = input_path.stem + '_converted' + ext
         
         output_path = output_dir / output_filename
@@ -633,7 +817,7 @@ def run_converter():
         if not args.format:
             print("Error: --watch requires a format")
             sys.exit(1)
-        watch_directory(slides_dir, args)
+        watch_directory(slides_dir, output_dir, args)
         sys.exit(0)
     
     # Handle batch mode
@@ -649,18 +833,16 @@ def run_converter():
         # First conversion will happen below, then we'll do second format
     
     # Check and install dependencies if needed
-    if not check_and_install_dependencies(args.method, args.format):
+    from utils.dependencies import check_and_install_dependencies
+    if not check_and_install_dependencies(args.method, args.format, args.yes):
         sys.exit(1)
     
-    # slides_dir already set above for clean command
-    output_dir = (script_dir / args.output_dir).resolve()
+    # Scan slides directory once; reuse the listing below
+    all_html_files = get_html_files(slides_dir)
     
     # Check if slides directory exists and has files
-    if not slides_dir.exists() or not get_html_files(str(slides_dir)):
-        handle_missing_slides(slides_dir)
-    
-    # Get HTML files
-    all_html_files = get_html_files(str(slides_dir))
+    if not all_html_files:
+        handle_missing_slides(slides_dir, args.yes, args.num_slides)
     
     # Handle range selection
     if args.range:
@@ -676,20 +858,15 @@ def run_converter():
     
     # Handle dry run
     if args.dry_run:
-        print(f"\n{'='*60}")
-        print("DRY RUN - No files will be created")
-        print(f"{'='*60}\n")
+        print(f"\n{_SEP}\nDRY RUN - No files will be created\n{_SEP}\n")
         print(f"Would convert {len(html_files)} slide(s):")
-        for i, file in enumerate(html_files, 1):
-            print(f"  {i}. {file.name}")
+        sys.stdout.write("\n".join(f"  {i}. {file.name}" for i, file in enumerate(html_files, 1)) + "\n")
         print(f"\nOutput format: {args.format.upper()}")
         print(f"Method: {args.method}")
         print(f"Output directory: {output_dir}")
         if args.output:
             print(f"Output filename: {args.output}")
-        print(f"\n{'='*60}")
-        print("Run without --dry-run to perform actual conversion")
-        print(f"{'='*60}\n")
+        print(f"\n{_SEP}\nRun without --dry-run to perform actual conversion\n{_SEP}\n")
         sys.exit(0)
     
     # Create output directory if it doesn't exist
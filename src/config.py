@@ -1,9 +1,15 @@
 """Configuration management for SlideForge."""
 
-import json
 from pathlib import Path
 from typing import Dict, Any
 
+# orjson parses faster when installed; the stdlib json module is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
 
 DEFAULT_CONFIG = {
     "method": "playwright",
@@ -14,6 +20,9 @@ DEFAULT_CONFIG = {
     "verbose": False
 }
 
+# In-process memo of the merged config; reset by invalidate_config_cache()
+_CONFIG_CACHE = None
+
 
 def get_config_path() -> Path:
     """Get the path to the config file."""
@@ -21,23 +30,36 @@ def get_config_path() -> Path:
 
 
 def load_config() -> Dict[str, Any]:
-    """Load configuration from file or return defaults."""
-    config_path = get_config_path()
+    """Load configuration from file or return defaults.
     
-    if not config_path.exists():
-        return DEFAULT_CONFIG.copy()
+    The result is cached for the rest of the process; treat it as read-only.
+    """
+    global _CONFIG_CACHE
+    
+    if _CONFIG_CACHE is not None:
+        return _CONFIG_CACHE
     
     try:
-        with open(config_path, 'r') as f:
-            user_config = json.load(f)
+        with open(get_config_path(), 'rb') as f:
+            data = f.read()
+        user_config = orjson.loads(data) if orjson else json.loads(data)
         
-        # Merge with defaults
-        config = DEFAULT_CONFIG.copy()
-        config.update(user_config)
-        return config
+        # Merge with defaults in one pass
+        config = {**DEFAULT_CONFIG, **user_config}
+    except FileNotFoundError:
+        config = dict(DEFAULT_CONFIG)
     except Exception as e:
         print(f"Warning: Failed to load config: {e}")
-        return DEFAULT_CONFIG.copy()
+        config = dict(DEFAULT_CONFIG)
+    
+    _CONFIG_CACHE = config
+    return config
+
+
+def invalidate_config_cache():
+    """Drop the cached config so the next load_config() re-reads the file."""
+    global _CONFIG_CACHE
+    _CONFIG_CACHE = None
 
 
 def save_config(config: Dict[str, Any]) -> bool:
@@ -48,9 +70,14 @@ def save_config(config: Dict[str, Any]) -> bool:
         # Create directory if it doesn't exist
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        if orjson:
+            with open(config_path, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(config_path, 'w') as f:
+                json.dump(config, f, indent=2)
         
+        invalidate_config_cache()
         return True
     except Exception as e:
         print(f"Error: Failed to save config: {e}")
@@ -78,7 +105,8 @@ def show_config():
 
 def set_config_value(key: str, value: str) -> bool:
     """Set a configuration value."""
-    config = load_config()
+    # Copy so a failed save leaves the cached config untouched
+    config = load_config().copy()
     
     if key not in DEFAULT_CONFIG:
         print(f"Error: Unknown config key '{key}'")
@@ -91,6 +119,11 @@ def set_config_value(key: str, value: str) -> bool:
     
     config[key] = value
     
+    if key == 'method':
+        # Switching backends: re-run the dependency check on the next conversion
+        from utils.dependencies import clear_dependency_stamps
+        clear_dependency_stamps()
+    
     if save_config(config):
         print(f"✓ Set {key} = {value}")
         return True
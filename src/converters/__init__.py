@@ -1,11 +1,28 @@
 """SlideForge converter modules for different methods."""
 
-from .playwright_converter import convert_to_pdf_playwright, convert_to_ppt_playwright
-from .weasyprint_converter import convert_to_pdf_weasyprint, convert_to_ppt_weasyprint
-
-__all__ = [
-    'convert_to_pdf_playwright',
-    'convert_to_ppt_playwright',
-    'convert_to_pdf_weasyprint',
-    'convert_to_ppt_weasyprint',
-]
+import importlib
+
+# Converters are loaded on first attribute access (PEP 562) so importing the
+# package does not pull in a backend that the current run never uses.
+_LAZY = {
+    'convert_to_pdf_playwright': '.playwright_converter',
+    'convert_to_ppt_playwright': '.playwright_converter',
+    'convert_to_pdf_weasyprint': '.weasyprint_converter',
+    'convert_to_ppt_weasyprint': '.weasyprint_converter',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    """Import a converter function from its submodule on first use."""
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,7 +1,35 @@
 """Convert between PDF, PPT, and PNG formats."""
 
 import sys
+import shutil
+import functools
 from pathlib import Path
+from typing import List, Optional
+
+
+# Skip the start center, first-start wizard, default document, crash-restart
+# and lock checks on launch
+_SOFFICE_FAST_START = ['--norestart', '--nologo', '--nofirststartwizard', '--nodefault', '--nolockcheck']
+
+# Checked when neither soffice nor libreoffice is on PATH
+_SOFFICE_FALLBACK_PATHS = [
+    '/Applications/LibreOffice.app/Contents/MacOS/soffice',
+    r'C:\Program Files\LibreOffice\program\soffice.exe',
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _find_soffice():
+    """Locate the LibreOffice binary once per process, or None if missing."""
+    for name in ('soffice', 'libreoffice'):
+        path = shutil.which(name)
+        if path:
+            return path
+    
+    for path in _SOFFICE_FALLBACK_PATHS:
+        if Path(path).is_file():
+            return path
+    return None
 
 
 def convert_pdf_to_ppt(pdf_path: str, output_path: str, quiet: bool = False):
@@ -10,6 +38,7 @@ def convert_pdf_to_ppt(pdf_path: str, output_path: str, quiet: bool = False):
         from pdf2image import convert_from_path
         from pptx import Presentation
         from pptx.util import Inches
+        from utils.pptx_utils import SlidePictureAdder
         import tempfile
         import os
     except ImportError:
@@ -22,52 +51,46 @@ def convert_pdf_to_ppt(pdf_path: str, output_path: str, quiet: bool = False):
         print(f"Converting PDF to PowerPoint: {pdf_path}")
     
     try:
-        # Convert PDF pages to images
-        if not quiet:
-            print("  Converting PDF pages to images...")
-        images = convert_from_path(pdf_path, dpi=150)
-        
-        if not images:
-            print("Error: No pages found in PDF")
-            sys.exit(1)
-        
-        # Create presentation
-        prs = Presentation()
-        prs.slide_width = Inches(16)
-        prs.slide_height = Inches(9)
-        
-        temp_files = []
-        
-        if not quiet:
-            print(f"  Creating PowerPoint with {len(images)} slides...")
-        
-        for i, image in enumerate(images, 1):
+        # Default temp location, not /dev/shm: poppler writes every page
+        # before returning, so the whole deck's images exist at once
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Convert PDF pages to images; poppler writes them to disk in
+            # parallel so only paths, not every decoded page, are held in RAM
             if not quiet:
-                print(f"    Processing page {i}/{len(images)}")
+                print("  Converting PDF pages to images...")
+            image_paths = convert_from_path(
+                pdf_path, dpi=150, output_folder=temp_dir, fmt='png',
+                paths_only=True, thread_count=os.cpu_count() or 1
+            )
             
-            # Save image to temp file
-            temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            temp_files.append(temp_img.name)
-            image.save(temp_img.name, 'PNG')
+            if not image_paths:
+                print("Error: No pages found in PDF")
+                sys.exit(1)
             
-            # Add slide
+            # Create presentation
+            prs = Presentation()
+            prs.slide_width = Inches(16)
+            prs.slide_height = Inches(9)
+            pictures = SlidePictureAdder(prs)
             blank_slide_layout = prs.slide_layouts[6]
-            slide = prs.slides.add_slide(blank_slide_layout)
-            slide.shapes.add_picture(temp_img.name, 0, 0, width=prs.slide_width, height=prs.slide_height)
-        
-        # Save presentation
-        prs.save(output_path)
-        
-        # Clean up temp files
-        for temp_file in temp_files:
-            try:
-                os.remove(temp_file)
-            except Exception:
-                pass
+            
+            if not quiet:
+                print(f"  Creating PowerPoint with {len(image_paths)} slides...")
+            
+            for i, image_path in enumerate(image_paths, 1):
+                if not quiet:
+                    print(f"    Processing page {i}/{len(image_paths)}")
+                
+                # Add slide
+                slide = prs.slides.add_slide(blank_slide_layout)
+                pictures.add_full_slide(slide, image_path)
+            
+            # Save presentation
+            prs.save(output_path)
         
         if not quiet:
             print(f"✓ PowerPoint created: {output_path}")
-            print(f"  ({len(images)} pages converted)")
+            print(f"  ({len(image_paths)} pages converted)")
         
     except Exception as e:
         print(f"Error converting PDF to PPT: {e}")
@@ -77,8 +100,76 @@ def convert_pdf_to_ppt(pdf_path: str, output_path: str, quiet: bool = False):
         sys.exit(1)
 
 
+def _render_fallback_page(index: int, image_bytes: Optional[bytes], texts: List[str]) -> bytes:
+    """Draw one slide's picture, or its text, as a 1280x720 PDF page (worker process)."""
+    from reportlab import rl_config
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.utils import ImageReader
+    from utils.file_utils import scratch_dir
+    import io
+    import os
+    import tempfile
+    import textwrap
+    
+    # Store image streams binary instead of ASCII85 text (25% larger)
+    rl_config.useA85 = 0
+    
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(1280, 720))
+    
+    image_drawn = False
+    if image_bytes:
+        jpeg_path = None
+        try:
+            if image_bytes[:3] == b'\xff\xd8\xff':
+                # reportlab embeds a .jpg file's bytes as they are; an ImageReader
+                # would first be decoded to RGB just to name the image
+                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False, dir=scratch_dir()) as jpeg_file:
+                    jpeg_file.write(image_bytes)
+                jpeg_path = image = jpeg_file.name
+            else:
+                image = ImageReader(io.BytesIO(image_bytes))
+            
+            # Draw image to fill the page
+            c.drawImage(image, 0, 0, width=1280, height=720, preserveAspectRatio=False)
+            image_drawn = True
+        except Exception:
+            # Formats reportlab cannot read (EMF, WMF, ...): fall back to the text
+            pass
+        finally:
+            if jpeg_path:
+                os.remove(jpeg_path)
+    
+    if not image_drawn:
+        y_position = 650
+        c.setFont("Helvetica-Bold", 24)
+        c.drawString(50, y_position, f"Slide {index}")
+        y_position -= 40
+        
+        c.setFont("Helvetica", 14)
+        wrapper = textwrap.TextWrapper(width=80)
+        for text in texts:
+            # Wrap text
+            lines = wrapper.wrap(text)
+            for line in lines:
+                c.drawString(50, y_position, line)
+                y_position -= 20
+            if lines:
+                y_position -= 10
+            
+            if y_position < 50:
+                break
+    
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
 def convert_ppt_to_pdf(ppt_path: str, output_path: str, quiet: bool = False):
     """Convert PowerPoint to PDF."""
+    import os
+    import tempfile
+    
     try:
         from pptx import Presentation
     except ImportError:
@@ -86,18 +177,17 @@ def convert_ppt_to_pdf(ppt_path: str, output_path: str, quiet: bool = False):
         print("Install with: pip install python-pptx")
         sys.exit(1)
     
+    # Probes only: the fallback renderer imports these in its worker
+    # processes, so fail here with an install hint instead
     try:
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import landscape, letter
+        import reportlab
     except ImportError:
         print("Error: reportlab not installed")
         print("Install with: pip install reportlab")
         sys.exit(1)
     
     try:
-        from PIL import Image
-        import tempfile
-        import os
+        import PIL
     except ImportError:
         print("Error: pillow not installed")
         print("Install with: pip install pillow")
@@ -122,7 +212,6 @@ def convert_ppt_to_pdf(ppt_path: str, output_path: str, quiet: bool = False):
         # Note: This is a simplified conversion
         # For production use, consider using LibreOffice or PowerPoint's native export
         
-        from PyPDF2 import PdfMerger
         import subprocess
         
         # Try using LibreOffice if available (best quality)
@@ -130,12 +219,23 @@ def convert_ppt_to_pdf(ppt_path: str, output_path: str, quiet: bool = False):
             if not quiet:
                 print("  Attempting conversion with LibreOffice...")
             
-            result = subprocess.run(
-                ['soffice', '--headless', '--convert-to', 'pdf', '--outdir', 
-                 str(Path(output_path).parent), ppt_path],
-                capture_output=True,
-                timeout=60
-            )
+            soffice = _find_soffice()
+            if soffice is None:
+                raise FileNotFoundError('soffice')
+            
+            # A private profile per run: concurrent conversions sharing the
+            # user's profile fight over its lock and can hang or corrupt it
+            profile_dir = tempfile.mkdtemp(prefix='slideforge-lo-')
+            try:
+                result = subprocess.run(
+                    [soffice, '--headless', *_SOFFICE_FAST_START,
+                     f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+                     '--convert-to', 'pdf', '--outdir', str(Path(output_path).parent), ppt_path],
+                    capture_output=True,
+                    timeout=60
+                )
+            finally:
+                shutil.rmtree(profile_dir, ignore_errors=True)
             
             if result.returncode == 0:
                 # LibreOffice creates filename.pdf in output dir
@@ -161,74 +261,44 @@ def convert_ppt_to_pdf(ppt_path: str, output_path: str, quiet: bool = False):
         print("\n⚠️  LibreOffice not available - using image extraction method")
         print("For best results, install LibreOffice: brew install libreoffice (macOS)\n")
         
-        # Try to extract images from slides
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.utils import ImageReader
-        import io
-        
+        # Pull each slide's picture or text out here; python-pptx objects
+        # do not pickle, plain bytes and strings do
         if not quiet:
             print("  Extracting slide images...")
         
-        # Create PDF with reportlab
-        c = canvas.Canvas(output_path, pagesize=(1280, 720))
-        
-        slides_processed = 0
+        contents = []
         for i, slide in enumerate(prs.slides, 1):
             if not quiet:
                 print(f"    Processing slide {i}/{len(prs.slides)}")
             
-            # Try to extract images from slide (slides created from screenshots have images)
-            image_found = False
+            # Slides created from screenshots have images
+            image_bytes = None
             for shape in slide.shapes:
                 if shape.shape_type == 13:  # Picture type
                     try:
-                        image = shape.image
-                        image_bytes = image.blob
-                        img_reader = ImageReader(io.BytesIO(image_bytes))
-                        
-                        # Draw image to fill the page
-                        c.drawImage(img_reader, 0, 0, width=1280, height=720, preserveAspectRatio=False)
-                        image_found = True
-                        slides_processed += 1
+                        image_bytes = shape.image.blob
                         break
                     except Exception as e:
                         if not quiet:
                             print(f"      Warning: Could not extract image from slide {i}: {e}")
             
-            # If no image found, try to render text content
-            if not image_found:
-                y_position = 650
-                c.setFont("Helvetica-Bold", 24)
-                c.drawString(50, y_position, f"Slide {i}")
-                y_position -= 40
-                
-                c.setFont("Helvetica", 14)
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text.strip():
-                        # Wrap text
-                        text = shape.text.strip()
-                        words = text.split()
-                        line = ""
-                        for word in words:
-                            test_line = line + word + " "
-                            if len(test_line) > 80:
-                                c.drawString(50, y_position, line)
-                                y_position -= 20
-                                line = word + " "
-                            else:
-                                line = test_line
-                        if line:
-                            c.drawString(50, y_position, line)
-                            y_position -= 30
-                        
-                        if y_position < 50:
-                            break
-                
-                slides_processed += 1
+            texts = [shape.text for shape in slide.shapes if hasattr(shape, "text") and shape.text.strip()]
+            contents.append((i, image_bytes, texts))
+        
+        # Drawing and encoding each page is independent CPU work: spread it
+        # over processes unless the deck is too small to pay for the pool
+        workers = min(len(contents), os.cpu_count() or 1)
+        if workers > 1 and len(contents) >= 4:
+            from concurrent.futures import ProcessPoolExecutor
             
-            c.showPage()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pages = list(executor.map(_render_fallback_page, *zip(*contents)))
+        else:
+            pages = [_render_fallback_page(*content) for content in contents]
+        
+        from utils.pdf_utils import merge_pdfs
         
-        c.save()
+        slides_processed = merge_pdfs(pages, output_path, quiet, [f"slide {i}" for i, _, _ in contents])
         
         if not quiet:
             if slides_processed > 0:
@@ -249,6 +319,7 @@ def convert_pdf_to_png(pdf_path: str, output_dir: str, quiet: bool = False):
     try:
         from pdf2image import convert_from_path
         import os
+        import tempfile
     except ImportError:
         print("Error: pdf2image not installed")
         print("Install with: pip install pdf2image")
@@ -259,15 +330,6 @@ def convert_pdf_to_png(pdf_path: str, output_dir: str, quiet: bool = False):
         print(f"Converting PDF to PNG images: {pdf_path}")
     
     try:
-        # Convert PDF pages to images
-        if not quiet:
-            print("  Converting PDF pages to images...")
-        images = convert_from_path(pdf_path, dpi=300)
-        
-        if not images:
-            print("Error: No pages found in PDF")
-            sys.exit(1)
-        
         # Create output directory if it doesn't exist
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
@@ -275,23 +337,39 @@ def convert_pdf_to_png(pdf_path: str, output_dir: str, quiet: bool = False):
         # Get base filename from PDF
         pdf_name = Path(pdf_path).stem
         
+        # pdftoppm encodes the PNGs itself, one process per CPU for its
+        # share of the pages, instead of piping raw bitmaps back for PIL
+        # to encode one by one. It writes into a scratch folder on the
+        # same filesystem so the files can be renamed into place.
         if not quiet:
-            print(f"  Saving {len(images)} PNG images...")
-        
-        saved_files = []
-        for i, image in enumerate(images, 1):
-            # Save each page as PNG
-            png_filename = f"{pdf_name}_page{i}.png"
-            png_path = output_path / png_filename
-            image.save(str(png_path), 'PNG')
-            saved_files.append(png_path)
+            print("  Converting PDF pages to images...")
+        with tempfile.TemporaryDirectory(dir=output_path) as temp_dir:
+            image_paths = convert_from_path(
+                pdf_path, dpi=300, output_folder=temp_dir, fmt='png',
+                paths_only=True, thread_count=os.cpu_count() or 1
+            )
+            
+            if not image_paths:
+                print("Error: No pages found in PDF")
+                sys.exit(1)
             
             if not quiet:
-                print(f"    Saved: {png_filename}")
+                print(f"  Saving {len(image_paths)} PNG images...")
+            
+            saved_files = []
+            # pdf2image returns the paths in page order
+            for i, image_path in enumerate(image_paths, 1):
+                png_filename = f"{pdf_name}_page{i}.png"
+                png_path = output_path / png_filename
+                os.replace(image_path, png_path)
+                saved_files.append(png_path)
+                
+                if not quiet:
+                    print(f"    Saved: {png_filename}")
         
         if not quiet:
             print(f"\n✓ Created {len(saved_files)} PNG images in: {output_dir}")
-            print(f"  Files: {pdf_name}_page1.png to {pdf_name}_page{len(images)}.png")
+            print(f"  Files: {pdf_name}_page1.png to {pdf_name}_page{len(saved_files)}.png")
         
         return saved_files
         
@@ -1,83 +1,163 @@
 """Parallel processing for faster conversions."""
 
+import hashlib
 import os
 import sys
+import shutil
 import tempfile
+import multiprocessing
 from pathlib import Path
-from typing import List
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
 
+from .playwright_converter import fit_to_page, load_slide, render_deck_pdf
 
-def convert_single_slide_playwright_pdf(html_file: Path, output_dir: str, index: int) -> tuple:
-    """Convert a single HTML slide to PDF using Playwright."""
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    # Only the Playwright workers need it; sharded WeasyPrint runs without it
+    sync_playwright = None
+
+# Per-process browser, started by _worker_init in each pool worker
+_playwright = None
+_browser = None
+_browser_error = None
+
+
+def _get_max_workers(requested: int, slide_count: int) -> int:
+    """Cap worker processes; each one runs its own Chromium."""
+    return max(1, min(requested, os.cpu_count() or 1, slide_count, 8))
+
+
+def _split_into_chunks(html_files: List[Path], workers: int) -> List[List[Tuple[int, Path]]]:
+    """Split slides into at most `workers` contiguous (index, file) chunks."""
+    indexed = list(enumerate(html_files))
+    chunk_count = max(1, min(workers, len(indexed)))
+    size, extra = divmod(len(indexed), chunk_count)
+    
+    chunks = []
+    start = 0
+    for i in range(chunk_count):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(indexed[start:end])
+        start = end
+    return chunks
+
+
+def _worker_init():
+    """Start Playwright and one Chromium per worker process, reused by every task."""
+    global _playwright, _browser, _browser_error
     try:
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page(viewport={'width': 1280, 'height': 720})
-            
-            page.goto(f"file://{html_file.absolute()}", timeout=30000)
-            page.wait_for_load_state('networkidle', timeout=30000)
-            
-            # Create temp PDF
-            temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', dir=output_dir)
-            page.pdf(path=temp_pdf.name, width='1280px', height='720px', print_background=True)
-            
-            browser.close()
-            
-            return (index, temp_pdf.name, None)
+        if sync_playwright is None:
+            raise ImportError("playwright is not installed (pip install playwright && playwright install chromium)")
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch()
+        # Pool workers skip atexit, so close the browser from multiprocessing's exit hook
+        Finalize(None, _worker_shutdown, exitpriority=10)
     except Exception as e:
-        return (index, None, str(e))
+        # Reported per slide by the tasks; raising here would break the whole pool
+        _browser_error = str(e)
 
 
-def convert_single_slide_playwright_ppt(html_file: Path, output_dir: str, index: int) -> tuple:
-    """Convert a single HTML slide to image using Playwright."""
+def _worker_shutdown():
+    """Close the worker's browser and stop its Playwright driver."""
     try:
-        from playwright.sync_api import sync_playwright
-        from PIL import Image
-        import io
+        _browser.close()
+        _playwright.stop()
+    except Exception:
+        pass
+
+
+def _render_chunk_playwright(chunk: List[Tuple[int, Path]], output_dir: Optional[str], kind: str) -> List[tuple]:
+    """Render a chunk of slides through the worker's browser on one page.
+    
+    kind is 'pdf' for in-memory PDF bytes or 'ppt' for JPEG screenshots
+    saved in output_dir. Returns an (index, result, error) tuple for every
+    slide in the chunk. A PDF chunk is normally rendered as one multi-page
+    PDF: the first slide carries its bytes and the rest come back as
+    (index, None, None).
+    """
+    if _browser is None:
+        # Browser failed to start: every slide in the chunk fails
+        return [(index, None, _browser_error or "browser not started") for index, _ in chunk]
+    
+    page = _browser.new_page(viewport={'width': 1280, 'height': 720})
+    try:
+        if kind == 'pdf':
+            try:
+                pdf_bytes = render_deck_pdf(page, [html_file for _, html_file in chunk])
+                return [(index, pdf_bytes if i == 0 else None, None) for i, (index, _) in enumerate(chunk)]
+            except Exception:
+                # Fall back to one PDF per slide so a bad slide only loses itself
+                pass
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page(viewport={'width': 1280, 'height': 720})
-            
-            page.goto(f"file://{html_file.absolute()}", timeout=30000)
-            page.wait_for_load_state('networkidle', timeout=30000)
-            
-            # Take screenshot
-            screenshot = page.screenshot()
-            
-            # Save to temp file
-            img = Image.open(io.BytesIO(screenshot))
-            temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir=output_dir)
-            img.save(temp_img.name)
-            
-            browser.close()
-            
-            return (index, temp_img.name, None)
-    except Exception as e:
-        return (index, None, str(e))
+        results = []
+        loaded = None
+        for index, html_file in chunk:
+            try:
+                loaded = load_slide(page, html_file, loaded)
+                if kind == 'pdf':
+                    # Match the deck path, which clips every slide to its page
+                    fit_to_page(page)
+                    result = _render_slide_pdf(page)
+                else:
+                    result = _render_slide_jpeg(page, output_dir)
+                results.append((index, result, None))
+            except Exception as e:
+                loaded = None
+                results.append((index, None, str(e)))
+        
+        return results
+    finally:
+        page.close()
+
 
+def _render_slide_pdf(page) -> bytes:
+    """Render the slide loaded in page to PDF bytes."""
+    # No path: the PDF comes back in memory, skipping a temp file round-trip
+    return page.pdf(width='1280px', height='720px', print_background=True)
 
-def parallel_convert_to_pdf_playwright(html_files: List[Path], output_path: str, workers: int = 4, quiet: bool = False):
+
+def _render_slide_jpeg(page, output_dir: str) -> str:
+    """Render the slide loaded in page to a JPEG in output_dir named by its content."""
+    # JPEG is far cheaper to encode than PNG
+    screenshot = page.screenshot(type='jpeg', quality=85)
+    
+    # Identical slides (title cards, blank transitions) share one file, which
+    # the main process then reads and embeds only once
+    img_path = os.path.join(output_dir, hashlib.blake2b(screenshot, digest_size=16).hexdigest() + '.jpg')
+    if not os.path.exists(img_path):
+        temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.tmp', dir=output_dir)
+        with temp_img:
+            temp_img.write(screenshot)
+        # Atomic, so a worker writing the same image never exposes a partial file
+        os.replace(temp_img.name, img_path)
+    
+    return img_path
+
+
+def parallel_convert_to_pdf_playwright(html_files: List[Path], output_path: Union[str, Path], workers: int = 4, quiet: bool = False):
     """Convert HTML slides to PDF using parallel processing."""
-    from PyPDF2 import PdfMerger
+    from utils.pdf_utils import OrderedPdfMerger
+    
+    workers = _get_max_workers(workers, len(html_files))
     
     if not quiet:
         print(f"Converting {len(html_files)} HTML slides to PDF using Playwright (parallel mode with {workers} workers)...")
     
-    temp_dir = tempfile.mkdtemp()
-    results = {}
+    converted = 0
     
     try:
-        # Use ThreadPoolExecutor for I/O bound tasks (Playwright)
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            # Submit all tasks
-            futures = {
-                executor.submit(convert_single_slide_playwright_pdf, html_file, temp_dir, i): i
-                for i, html_file in enumerate(html_files)
-            }
+        # Processes, not threads: the sync Playwright driver serializes threads.
+        # Spawn gives each worker a clean interpreter for its own event loop.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_worker_init) as executor:
+            # One task per chunk; each worker launched its browser once in _worker_init
+            futures = [
+                executor.submit(_render_chunk_playwright, chunk, None, 'pdf')
+                for chunk in _split_into_chunks(html_files, workers)
+            ]
             
             # Show progress
             try:
@@ -86,67 +166,50 @@ def parallel_convert_to_pdf_playwright(html_files: List[Path], output_path: str,
             except ImportError:
                 progress = None
             
-            # Collect results
+            # Merge results in slide order while later chunks are still rendering
+            # (slides inside a chunk PDF have no bytes of their own)
+            merger = OrderedPdfMerger(quiet)
             for future in as_completed(futures):
-                index, pdf_path, error = future.result()
-                
-                if error:
-                    if not quiet:
-                        print(f"  Warning: Failed to process slide {index + 1}: {error}")
-                else:
-                    results[index] = pdf_path
-                
-                if progress:
-                    progress.update(1)
+                for index, pdf_bytes, error in future.result():
+                    if error:
+                        if not quiet:
+                            print(f"  Warning: Failed to process slide {index + 1}: {error}")
+                    else:
+                        converted += 1
+                    merger.add(index, pdf_bytes, f"slides from {index + 1}")
+                    
+                    if progress:
+                        progress.update(1)
             
             if progress:
                 progress.close()
         
-        if not results:
+        if not converted:
             print("Error: No slides were successfully converted")
             sys.exit(1)
         
-        # Merge PDFs in order
         if not quiet:
             print("Merging PDFs...")
         
-        merger = PdfMerger()
-        for i in sorted(results.keys()):
-            try:
-                merger.append(results[i])
-            except Exception as e:
-                if not quiet:
-                    print(f"  Warning: Failed to merge slide {i + 1}: {e}")
-        
-        merger.write(output_path)
-        merger.close()
+        merger.finish(output_path)
         
         if not quiet:
             print(f"✓ PDF created successfully: {output_path}")
-            print(f"  ({len(results)}/{len(html_files)} slides converted)")
+            print(f"  ({converted}/{len(html_files)} slides converted)")
         
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
-    finally:
-        # Clean up temp files
-        for pdf_path in results.values():
-            try:
-                if os.path.exists(pdf_path):
-                    os.remove(pdf_path)
-            except Exception:
-                pass
-        
-        try:
-            os.rmdir(temp_dir)
-        except Exception:
-            pass
 
 
-def parallel_convert_to_ppt_playwright(html_files: List[Path], output_path: str, workers: int = 4, quiet: bool = False):
+def parallel_convert_to_ppt_playwright(html_files: List[Path], output_path: Union[str, Path], workers: int = 4, quiet: bool = False):
     """Convert HTML slides to PowerPoint using parallel processing."""
     from pptx import Presentation
     from pptx.util import Inches
+    from utils.pptx_utils import SlidePictureAdder
+    from utils.file_utils import scratch_dir
+    
+    workers = _get_max_workers(workers, len(html_files))
     
     if not quiet:
         print(f"Converting {len(html_files)} HTML slides to PowerPoint using Playwright (parallel mode with {workers} workers)...")
@@ -155,18 +218,24 @@ def parallel_convert_to_ppt_playwright(html_files: List[Path], output_path: str,
     prs = Presentation()
     prs.slide_width = Inches(16)
     prs.slide_height = Inches(9)
+    pictures = SlidePictureAdder(prs)
+    blank_slide_layout = prs.slide_layouts[6]
     
-    temp_dir = tempfile.mkdtemp()
-    results = {}
+    temp_dir = tempfile.mkdtemp(dir=scratch_dir())
+    # Slide indices are dense, so a list keeps them in order without sorting
+    results = [None] * len(html_files)
+    converted = 0
     
     try:
-        # Use ThreadPoolExecutor for I/O bound tasks
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            # Submit all tasks
-            futures = {
-                executor.submit(convert_single_slide_playwright_ppt, html_file, temp_dir, i): i
-                for i, html_file in enumerate(html_files)
-            }
+        # Processes, not threads: the sync Playwright driver serializes threads.
+        # Spawn gives each worker a clean interpreter for its own event loop.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_worker_init) as executor:
+            # One task per chunk; each worker launched its browser once in _worker_init
+            futures = [
+                executor.submit(_render_chunk_playwright, chunk, temp_dir, 'ppt')
+                for chunk in _split_into_chunks(html_files, workers)
+            ]
             
             # Show progress
             try:
@@ -177,21 +246,21 @@ def parallel_convert_to_ppt_playwright(html_files: List[Path], output_path: str,
             
             # Collect results
             for future in as_completed(futures):
-                index, img_path, error = future.result()
-                
-                if error:
-                    if not quiet:
-                        print(f"  Warning: Failed to process slide {index + 1}: {error}")
-                else:
-                    results[index] = img_path
-                
-                if progress:
-                    progress.update(1)
+                for index, img_path, error in future.result():
+                    if error:
+                        if not quiet:
+                            print(f"  Warning: Failed to process slide {index + 1}: {error}")
+                    else:
+                        results[index] = img_path
+                        converted += 1
+                    
+                    if progress:
+                        progress.update(1)
             
             if progress:
                 progress.close()
         
-        if not results:
+        if not converted:
             print("Error: No slides were successfully converted")
             sys.exit(1)
         
@@ -199,11 +268,12 @@ def parallel_convert_to_ppt_playwright(html_files: List[Path], output_path: str,
         if not quiet:
             print("Creating PowerPoint...")
         
-        for i in sorted(results.keys()):
+        for i, img_path in enumerate(results):
+            if img_path is None:
+                continue
             try:
-                blank_slide_layout = prs.slide_layouts[6]
                 slide = prs.slides.add_slide(blank_slide_layout)
-                slide.shapes.add_picture(results[i], 0, 0, width=prs.slide_width, height=prs.slide_height)
+                pictures.add_full_slide(slide, img_path)
             except Exception as e:
                 if not quiet:
                     print(f"  Warning: Failed to add slide {i + 1}: {e}")
@@ -213,21 +283,83 @@ def parallel_convert_to_ppt_playwright(html_files: List[Path], output_path: str,
         
         if not quiet:
             print(f"✓ PowerPoint created successfully: {output_path}")
-            print(f"  ({len(results)}/{len(html_files)} slides converted)")
+            print(f"  ({converted}/{len(html_files)} slides converted)")
         
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
     finally:
-        # Clean up temp files
-        for img_path in results.values():
-            try:
-                if os.path.exists(img_path):
-                    os.remove(img_path)
-            except Exception:
-                pass
+        # Every temp file lives in temp_dir, so one rmtree removes them all
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _convert_pdf_shard(method: str, html_files: List[Path], output_path: Union[str, Path]) -> Optional[Union[str, Path]]:
+    """Convert one contiguous shard of slides to a partial PDF (worker process)."""
+    try:
+        if method == 'weasyprint':
+            from .weasyprint_converter import convert_to_pdf_weasyprint
+            
+            # Already inside a pool worker: render this shard in-process
+            convert_to_pdf_weasyprint(html_files, output_path, workers=1)
+        else:
+            from .playwright_converter import convert_to_pdf_playwright
+            
+            convert_to_pdf_playwright(html_files, output_path)
+        return output_path
+    except SystemExit:
+        # Backends exit when no slide in the shard could be converted
+        return None
+
+
+def sharded_convert_to_pdf(method: str, html_files: List[Path], output_path: Union[str, Path], workers: int = None, quiet: bool = False, batch_size: int = 1000):
+    """Convert HTML slides to PDF by sharding the deck across worker processes.
+    
+    Each shard holds at most batch_size slides; larger decks produce more
+    shards than workers and the pool works through them in order.
+    """
+    cpus = os.cpu_count() or 1
+    workers = min(len(html_files), workers or cpus, cpus)
+    
+    # Pool startup is not worth it for tiny decks
+    if workers < 2 or len(html_files) < 4:
+        if not _convert_pdf_shard(method, html_files, output_path):
+            sys.exit(1)
+        return
+    
+    from utils.pdf_utils import merge_pdfs
+    from utils.file_utils import scratch_dir
+    
+    if not quiet:
+        print(f"Converting {len(html_files)} HTML slides to PDF using {method} ({workers} worker processes)...")
+    
+    # Contiguous shards keep slide order when the partial PDFs are concatenated
+    shard_size = min(-(-len(html_files) // workers), max(1, batch_size))
+    shards = [html_files[i:i + shard_size] for i in range(0, len(html_files), shard_size)]
+    
+    temp_dir = tempfile.mkdtemp(dir=scratch_dir())
+    partial_paths = [os.path.join(temp_dir, f"shard{i}.pdf") for i in range(len(shards))]
+    
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            results = list(executor.map(_convert_pdf_shard, [method] * len(shards), shards, partial_paths))
         
-        try:
-            os.rmdir(temp_dir)
-        except Exception:
-            pass
+        converted = [path for path in results if path]
+        if not converted:
+            print("Error: No slides were successfully converted")
+            sys.exit(1)
+        
+        if not quiet:
+            print("Merging PDFs...")
+        
+        merge_pdfs(converted, output_path, quiet)
+        
+        if not quiet:
+            print(f"✓ PDF created successfully: {output_path}")
+            print(f"  ({len(converted)}/{len(shards)} shards converted)")
+        
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        # Every temp file lives in temp_dir, so one rmtree removes them all
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -1,16 +1,154 @@
 """Playwright-based conversion methods."""
 
 import os
+import re
 import sys
 import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
 
-def convert_to_pdf_playwright(html_files: List[Path], output_path: str, quiet: bool = False, verbose: bool = False):
+# Resolves once web fonts are loaded and two animation frames have painted,
+# instead of sleeping a fixed amount per slide
+_WAIT_FOR_RENDER = "() => document.fonts.ready.then(() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r))))"
+
+# Replaces the loaded slide's <body> with the one parsed from html and
+# resolves once its images, CSS background images and fonts have loaded.
+# Backgrounds and newly used font faces only start loading at the next
+# style pass, so one is forced (offsetHeight) before collecting them.
+_SWAP_BODY = """(html) => {
+    const doc = new DOMParser().parseFromString(html, 'text/html');
+    document.title = doc.title;
+    document.body.replaceWith(document.adoptNode(doc.body));
+    void document.body.offsetHeight;
+    
+    const urls = new Set();
+    for (const el of [document.body, ...document.body.querySelectorAll('*')]) {
+        for (const pseudo of [null, '::before', '::after']) {
+            const background = getComputedStyle(el, pseudo).backgroundImage;
+            for (const match of background.matchAll(/url\\("?(.*?)"?\\)/g)) {
+                urls.add(match[1]);
+            }
+        }
+    }
+    
+    const decode = img => img.decode().catch(() => null);
+    const backgrounds = Array.from(urls, url => {
+        const img = new Image();
+        img.src = url;
+        return decode(img);
+    });
+    return Promise.all([...Array.from(document.images, decode), ...backgrounds, document.fonts.ready]);
+}"""
+
+# Clips the slide to one 1280x720 page so tall content cannot spill over
+_FIT_TO_PAGE = """() => {
+    const slide = document.querySelector('.slide');
+    if (slide) {
+        slide.style.height = '720px';
+        slide.style.maxHeight = '720px';
+        slide.style.overflow = 'hidden';
+    }
+    document.body.style.height = '720px';
+    document.body.style.overflow = 'hidden';
+}"""
+
+_HEAD_RE = re.compile(r'<head\b[^>]*>(.*?)</head>', re.IGNORECASE | re.DOTALL)
+_TITLE_RE = re.compile(r'<title\b[^>]*>.*?</title>', re.IGNORECASE | re.DOTALL)
+
+# Stacks slides as fixed-size iframes, one per printed page, so Chromium
+# emits the whole deck from a single page.pdf() call
+_DECK_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+    @page {{ size: 1280px 720px; margin: 0; }}
+    html, body {{ margin: 0; padding: 0; }}
+    iframe {{ display: block; width: 1280px; height: 720px; border: 0; break-after: page; }}
+    iframe:last-child {{ break-after: auto; }}
+</style>
+</head>
+<body>
+{frames}
+</body>
+</html>
+"""
+
+
+def load_slide(page, html_file: Path, loaded: Optional[tuple] = None) -> Optional[tuple]:
+    """Show html_file in page and wait until it is painted.
+    
+    loaded is the value returned for the previous slide. When this slide is
+    in the same folder, has the same <head> (ignoring <title>) and no
+    scripts, only its <body> is swapped into the open document, so the
+    stylesheets and fonts are not loaded and parsed again. Otherwise the
+    page navigates to it. Returns the value to pass for the next slide.
+    """
+    html = html_file.read_text(encoding='utf-8', errors='replace')
+    head = _HEAD_RE.search(html)
+    key = None
+    if head and '<script' not in html.lower():
+        key = (html_file.absolute().parent, _TITLE_RE.sub('', head.group(1)))
+    
+    if key is not None and key == loaded:
+        page.evaluate(_SWAP_BODY, html)
+    else:
+        page.goto(f"file://{html_file.absolute()}", timeout=30000)
+        page.wait_for_load_state('networkidle', timeout=30000)
+    
+    # Wait for fonts and icons to load and be painted
+    page.evaluate(_WAIT_FOR_RENDER)
+    return key
+
+
+def fit_to_page(target):
+    """Clip the slide in target (a page or frame) to a single 1280x720 page."""
+    target.evaluate(_FIT_TO_PAGE)
+
+
+def render_deck_pdf(page, html_files: List[Path], output_path: Optional[Union[str, Path]] = None) -> bytes:
+    """Render several HTML slides into one multi-page PDF with a single page.pdf().
+    
+    Each slide keeps its own document (and styles) inside a 1280x720 iframe.
+    The PDF is written to output_path when given and always returned as bytes.
+    """
+    frames = "\n".join(f'<iframe src="{html_file.absolute().as_uri()}"></iframe>' for html_file in html_files)
+    
+    # The deck has to be a file:// page itself so it may frame local slides
+    deck_dir = tempfile.mkdtemp()
+    deck_path = Path(deck_dir) / 'deck.html'
+    try:
+        deck_path.write_text(_DECK_TEMPLATE.format(frames=frames), encoding='utf-8')
+        
+        page.goto(deck_path.as_uri(), timeout=30000)
+        page.wait_for_load_state('networkidle', timeout=30000)
+        
+        # Each slide gets the same clipping and paint wait as the
+        # per-slide path, so both lay slides out identically
+        for frame in page.frames[1:]:
+            fit_to_page(frame)
+            frame.evaluate(_WAIT_FOR_RENDER)
+        
+        return page.pdf(
+            path=str(output_path) if output_path else None,
+            width='1280px',
+            height='720px',
+            print_background=True,
+            prefer_css_page_size=False
+        )
+    finally:
+        try:
+            os.remove(deck_path)
+            os.rmdir(deck_dir)
+        except OSError:
+            pass
+
+
+def convert_to_pdf_playwright(html_files: List[Path], output_path: Union[str, Path], quiet: bool = False, verbose: bool = False):
     """Convert HTML slides to PDF using Playwright."""
     from playwright.sync_api import sync_playwright
-    from PyPDF2 import PdfMerger
+    from utils.pdf_utils import merge_pdfs
     
     try:
         from tqdm import tqdm
@@ -29,49 +167,47 @@ def convert_to_pdf_playwright(html_files: List[Path], output_path: str, quiet: b
             browser = p.chromium.launch()
             page = browser.new_page(viewport={'width': 1280, 'height': 720})
             
-            for i, html_file in enumerate(html_files, 1):
+            # Validate HTML files exist and are readable
+            existing = []
+            for html_file in html_files:
+                if html_file.exists():
+                    existing.append(html_file)
+                else:
+                    print(f"  Warning: File not found, skipping: {html_file}")
+            
+            # Fast path: the whole deck in one document and one page.pdf()
+            if existing:
                 try:
-                    print(f"  Processing slide {i}/{len(html_files)}: {html_file.name}")
-                    
-                    # Validate HTML file exists and is readable
-                    if not html_file.exists():
-                        print(f"  Warning: File not found, skipping: {html_file}")
-                        continue
-                    
-                    page.goto(f"file://{html_file.absolute()}", timeout=30000)
-                    page.wait_for_load_state('networkidle', timeout=30000)
-                    
-                    # Wait for fonts and icons to load
-                    page.wait_for_timeout(2000)
+                    if not quiet:
+                        print(f"  Rendering {len(existing)} slides in a single pass...")
+                    render_deck_pdf(page, existing, output_path)
+                    browser.close()
+                    print(f"✓ PDF created successfully: {output_path}")
+                    return
+                except Exception as e:
+                    print(f"  Warning: Single-pass render failed ({e}), rendering slides one by one")
+            
+            loaded = None
+            for i, html_file in enumerate(existing, 1):
+                try:
+                    print(f"  Processing slide {i}/{len(existing)}: {html_file.name}")
                     
-                    # Wait for document to be ready
-                    page.evaluate("() => document.fonts.ready")
+                    loaded = load_slide(page, html_file, loaded)
                     
                     # Force content to fit in one page by setting max-height
-                    page.evaluate("""() => {
-                        const slide = document.querySelector('.slide');
-                        if (slide) {
-                            slide.style.height = '720px';
-                            slide.style.maxHeight = '720px';
-                            slide.style.overflow = 'hidden';
-                        }
-                        document.body.style.height = '720px';
-                        document.body.style.overflow = 'hidden';
-                    }""")
+                    fit_to_page(page)
                     
-                    # Create temp PDF for this slide
-                    temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-                    page.pdf(
-                        path=temp_pdf.name, 
+                    # Keep this slide's PDF in memory until the merge
+                    pdf_files.append(page.pdf(
                         width='1280px', 
                         height='720px', 
                         print_background=True,
                         prefer_css_page_size=False
-                    )
-                    pdf_files.append(temp_pdf.name)
+                    ))
                     
                 except Exception as e:
                     print(f"  Warning: Failed to process {html_file.name}: {e}")
+                    loaded = None
                     continue
             
             browser.close()
@@ -81,15 +217,7 @@ def convert_to_pdf_playwright(html_files: List[Path], output_path: str, quiet: b
             sys.exit(1)
         
         # Merge all PDFs
-        merger = PdfMerger()
-        for pdf_file in pdf_files:
-            try:
-                merger.append(pdf_file)
-            except Exception as e:
-                print(f"  Warning: Failed to merge {pdf_file}: {e}")
-        
-        merger.write(output_path)
-        merger.close()
+        merge_pdfs(pdf_files, output_path)
         
         print(f"✓ PDF created successfully: {output_path}")
         
@@ -97,23 +225,15 @@ def convert_to_pdf_playwright(html_files: List[Path], output_path: str, quiet: b
         print(f"Error: {e}")
         print("Make sure you've run: playwright install chromium")
         sys.exit(1)
-    finally:
-        # Clean up temp files
-        for pdf_file in pdf_files:
-            try:
-                if os.path.exists(pdf_file):
-                    os.remove(pdf_file)
-            except Exception:
-                pass
 
 
-def convert_to_ppt_playwright(html_files: List[Path], output_path: str):
+def convert_to_ppt_playwright(html_files: List[Path], output_path: Union[str, Path]):
     """Convert HTML slides to PowerPoint using Playwright."""
     from playwright.sync_api import sync_playwright
     from pptx import Presentation
     from pptx.util import Inches
-    from PIL import Image
-    import io
+    from utils.pptx_utils import SlidePictureAdder
+    from utils.file_utils import scratch_dir
     
     print(f"Converting {len(html_files)} HTML slides to PowerPoint using Playwright...")
     
@@ -121,6 +241,9 @@ def convert_to_ppt_playwright(html_files: List[Path], output_path: str):
     prs = Presentation()
     prs.slide_width = Inches(16)
     prs.slide_height = Inches(9)
+    pictures = SlidePictureAdder(prs)
+    blank_slide_layout = prs.slide_layouts[6]
+    scratch = scratch_dir()
     
     browser = None
     temp_images = []
@@ -131,6 +254,7 @@ def convert_to_ppt_playwright(html_files: List[Path], output_path: str):
             browser = p.chromium.launch()
             page = browser.new_page(viewport={'width': 1280, 'height': 720})
             
+            loaded = None
             for i, html_file in enumerate(html_files, 1):
                 temp_img_path = None
                 try:
@@ -141,32 +265,25 @@ def convert_to_ppt_playwright(html_files: List[Path], output_path: str):
                         print(f"  Warning: File not found, skipping: {html_file}")
                         continue
                     
-                    page.goto(f"file://{html_file.absolute()}", timeout=30000)
-                    page.wait_for_load_state('networkidle', timeout=30000)
+                    loaded = load_slide(page, html_file, loaded)
                     
-                    # Wait a bit for fonts to load
-                    page.wait_for_timeout(500)
-                    
-                    # Take screenshot
-                    screenshot = page.screenshot()
+                    # Screenshot straight to a temp JPEG (far cheaper to encode than PNG)
+                    temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg', dir=scratch)
+                    temp_img.close()
+                    temp_img_path = temp_img.name
+                    temp_images.append(temp_img_path)
+                    page.screenshot(path=temp_img_path, type='jpeg', quality=85)
                     
                     # Add blank slide
-                    blank_slide_layout = prs.slide_layouts[6]
                     slide = prs.slides.add_slide(blank_slide_layout)
                     
-                    # Save screenshot to temp file
-                    img = Image.open(io.BytesIO(screenshot))
-                    temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                    temp_img_path = temp_img.name
-                    temp_images.append(temp_img_path)
-                    img.save(temp_img_path)
-                    
                     # Add image to slide
-                    slide.shapes.add_picture(temp_img_path, 0, 0, width=prs.slide_width, height=prs.slide_height)
+                    pictures.add_full_slide(slide, temp_img_path)
                     slides_created += 1
                     
                 except Exception as e:
                     print(f"  Warning: Failed to process {html_file.name}: {e}")
+                    loaded = None
                     continue
             
             browser.close()
@@ -188,7 +305,6 @@ def convert_to_ppt_playwright(html_files: List[Path], output_path: str):
         # Clean up temp files
         for temp_img in temp_images:
             try:
-                if os.path.exists(temp_img):
-                    os.remove(temp_img)
-            except Exception:
+                os.unlink(temp_img)
+            except OSError:
                 pass
@@ -2,84 +2,196 @@
 
 import os
 import sys
-import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple, Union
 
 
-def convert_to_pdf_weasyprint(html_files: List[Path], output_path: str):
-    """Convert HTML slides to PDF using WeasyPrint."""
-    from weasyprint import HTML, CSS
-    from PyPDF2 import PdfMerger
+# Fixed slide page size for every rendered slide
+_PAGE_CSS = '''
+    @page {
+        size: 1280px 720px;
+        margin: 0;
+    }
+'''
+
+# Parsed _PAGE_CSS, built on first use in each process
+_page_stylesheet = None
+
+
+def _get_page_css():
+    """Return the shared CSS object for _PAGE_CSS, parsing it only once."""
+    global _page_stylesheet
+    if _page_stylesheet is None:
+        from weasyprint import CSS
+        
+        _page_stylesheet = CSS(string=_PAGE_CSS)
+    return _page_stylesheet
+
+
+def _batches(paths: List[str], workers: int) -> List[List[str]]:
+    """Split paths into at most workers contiguous, near-equal batches."""
+    size = -(-len(paths) // workers)
+    return [paths[i:i + size] for i in range(0, len(paths), size)]
+
+
+def _render_slides_pdf(html_paths: List[str]) -> Tuple[Optional[bytes], List[Optional[str]]]:
+    """Render HTML slides into one PDF; returns (pdf_bytes, error per slide).
+    
+    Module level so worker processes can run it. All slides' pages go
+    into a single WeasyPrint document, so the PDF is serialized once and
+    shared fonts and images are embedded once.
+    """
+    from weasyprint import HTML
+    
+    css = _get_page_css()
+    errors = [None] * len(html_paths)
+    documents = []
+    for i, html_path in enumerate(html_paths):
+        try:
+            documents.append(HTML(filename=html_path).render(stylesheets=[css]))
+        except Exception as e:
+            errors[i] = str(e)
+    
+    if not documents:
+        return None, errors
+    
+    try:
+        pages = [page for document in documents for page in document.pages]
+        return documents[0].copy(pages).write_pdf(), errors
+    except Exception as e:
+        return None, [error or str(e) for error in errors]
+
+
+def convert_to_pdf_weasyprint(html_files: List[Path], output_path: Union[str, Path], workers: Optional[int] = None):
+    """Convert HTML slides to PDF using WeasyPrint.
+    
+    Slides render in up to workers processes (default and cap: one per CPU), each
+    producing one PDF for its share of the deck; small decks and
+    workers=1 render in this process with no merge step.
+    """
+    from utils.pdf_utils import merge_pdfs
     
     print(f"Converting {len(html_files)} HTML slides to PDF using WeasyPrint...")
     
-    pdf_files = []
+    existing = []
+    for html_file in html_files:
+        # Validate HTML file exists and is readable
+        if html_file.exists():
+            existing.append(html_file)
+        else:
+            print(f"  Warning: File not found, skipping: {html_file}")
     
     try:
-        for i, html_file in enumerate(html_files, 1):
-            try:
-                print(f"  Processing slide {i}/{len(html_files)}: {html_file.name}")
-                
-                # Validate HTML file exists and is readable
-                if not html_file.exists():
-                    print(f"  Warning: File not found, skipping: {html_file}")
-                    continue
-                
-                # Create temp PDF for this slide
-                temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-                
-                # Custom CSS for page size
-                css = CSS(string='''
-                    @page {
-                        size: 1280px 720px;
-                        margin: 0;
-                    }
-                ''')
-                
-                HTML(filename=str(html_file)).write_pdf(temp_pdf.name, stylesheets=[css])
-                pdf_files.append(temp_pdf.name)
-                
-            except Exception as e:
-                print(f"  Warning: Failed to process {html_file.name}: {e}")
-                continue
+        cpus = os.cpu_count() or 1
+        workers = min(len(existing), workers or cpus, cpus)
+        paths = [str(html_file) for html_file in existing]
+        
+        # Pool startup is not worth it for tiny decks
+        if workers > 1 and len(existing) >= 4:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            # Rendered documents cannot cross processes, so each worker
+            # returns the PDF for one contiguous batch
+            batches = _batches(paths, workers)
+            print(f"  Rendering {len(existing)} slides in {len(batches)} worker processes...")
+            # Spawn, not fork: callers such as watch mode run this from a
+            # thread while others are alive, and a forked child can
+            # inherit a lock one of them held
+            with ProcessPoolExecutor(max_workers=len(batches), mp_context=multiprocessing.get_context('spawn')) as executor:
+                results = list(executor.map(_render_slides_pdf, batches))
+        else:
+            print(f"  Rendering {len(existing)} slides...")
+            results = [_render_slides_pdf(paths)]
+        
+        pdf_files = []
+        converted = 0
+        errors = [error for _, batch_errors in results for error in batch_errors]
+        for html_file, error in zip(existing, errors):
+            if error:
+                print(f"  Warning: Failed to process {html_file.name}: {error}")
+            else:
+                converted += 1
+        for pdf_bytes, _ in results:
+            if pdf_bytes is not None:
+                pdf_files.append(pdf_bytes)
         
         if not pdf_files:
             print("Error: No slides were successfully converted")
             sys.exit(1)
         
-        # Merge all PDFs
-        merger = PdfMerger()
-        for pdf_file in pdf_files:
-            try:
-                merger.append(pdf_file)
-            except Exception as e:
-                print(f"  Warning: Failed to merge {pdf_file}: {e}")
-        
-        merger.write(output_path)
-        merger.close()
+        if len(pdf_files) == 1:
+            Path(output_path).write_bytes(pdf_files[0])
+        else:
+            # One PDF per worker batch, already in slide order
+            merge_pdfs(pdf_files, output_path)
         
         print(f"✓ PDF created successfully: {output_path}")
+        if converted < len(existing):
+            print(f"  ({converted}/{len(existing)} slides converted)")
         
     except Exception as e:
         print(f"Error creating PDF: {e}")
         sys.exit(1)
-    finally:
-        # Clean up temp files
-        for pdf_file in pdf_files:
-            try:
-                if os.path.exists(pdf_file):
-                    os.remove(pdf_file)
-            except Exception:
-                pass
 
 
-def convert_to_ppt_weasyprint(html_files: List[Path], output_path: str):
-    """Convert HTML to PPT via WeasyPrint PDF then to images."""
-    from weasyprint import HTML, CSS
-    from pdf2image import convert_from_path
+def _render_slides_jpeg(html_paths: List[str]) -> List[Tuple[Optional[bytes], Optional[str]]]:
+    """Render HTML slides to 150 DPI JPEG bytes; returns (jpeg_bytes, error) per slide.
+    
+    Module level so worker processes can run it. The slides' first pages
+    are combined into one in-memory PDF so a single pdftoppm run
+    rasterizes the whole batch, instead of one fork per slide.
+    """
+    from weasyprint import HTML
+    import io
+    
+    css = _get_page_css()
+    results = [(None, None)] * len(html_paths)
+    rendered = []
+    for i, html_path in enumerate(html_paths):
+        try:
+            rendered.append((i, HTML(filename=html_path).render(stylesheets=[css])))
+        except Exception as e:
+            results[i] = (None, str(e))
+    
+    if not rendered:
+        return results
+    
+    try:
+        from pdf2image import convert_from_bytes
+        
+        # WeasyPrint's documented way to merge documents: copy the pages into the first
+        pages = [document.pages[0] for _, document in rendered]
+        pdf_bytes = rendered[0][1].copy(pages).write_pdf()
+        images = convert_from_bytes(pdf_bytes, dpi=150)
+    except Exception as e:
+        for i, _ in rendered:
+            results[i] = (None, str(e))
+        return results
+    
+    for (i, _), image in zip(rendered, images):
+        # JPEG, like the Playwright screenshots: far cheaper to encode than
+        # PNG, and pptx embeds the bytes as they are
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=85)
+        results[i] = (buffer.getvalue(), None)
+    
+    for i, _ in rendered[len(images):]:
+        results[i] = (None, "no image generated")
+    return results
+
+
+def convert_to_ppt_weasyprint(html_files: List[Path], output_path: Union[str, Path], workers: Optional[int] = None):
+    """Convert HTML to PPT via WeasyPrint PDF then to images.
+    
+    Slides render in up to workers processes (default and cap: one per CPU) and
+    are added to the deck in order; small decks and workers=1 render in
+    this process.
+    """
     from pptx import Presentation
     from pptx.util import Inches
+    from utils.pptx_utils import SlidePictureAdder
+    import io
     
     print(f"Converting {len(html_files)} HTML slides to PowerPoint using WeasyPrint...")
     
@@ -87,55 +199,59 @@ def convert_to_ppt_weasyprint(html_files: List[Path], output_path: str):
     prs = Presentation()
     prs.slide_width = Inches(16)
     prs.slide_height = Inches(9)
+    pictures = SlidePictureAdder(prs)
+    # Indexing slide_layouts walks the master's XML, so look it up once
+    blank_slide_layout = prs.slide_layouts[6]
+    
+    existing = []
+    for html_file in html_files:
+        # Validate HTML file exists and is readable
+        if html_file.exists():
+            existing.append(html_file)
+        else:
+            print(f"  Warning: File not found, skipping: {html_file}")
     
-    temp_files = []
+    results = []
     slides_created = 0
     
     try:
-        for i, html_file in enumerate(html_files, 1):
-            temp_pdf_path = None
-            temp_img_path = None
+        cpus = os.cpu_count() or 1
+        workers = min(len(existing), workers or cpus, cpus)
+        paths = [str(html_file) for html_file in existing]
+        
+        # Pool startup is not worth it for tiny decks
+        if workers > 1 and len(existing) >= 4:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            # One contiguous batch per worker, so pdftoppm runs once per worker
+            batches = _batches(paths, workers)
+            print(f"  Rendering {len(existing)} slides in {len(batches)} worker processes...")
+            with ProcessPoolExecutor(max_workers=len(batches), mp_context=multiprocessing.get_context('spawn')) as executor:
+                for batch_results in executor.map(_render_slides_jpeg, batches):
+                    results.extend(batch_results)
+        else:
+            print(f"  Rendering {len(existing)} slides...")
+            results = _render_slides_jpeg(paths)
+        
+        # Add to presentation in slide order
+        for html_file, (jpeg_bytes, error) in zip(existing, results):
+            if error:
+                print(f"  Warning: Failed to process {html_file.name}: {error}")
+                continue
             
             try:
-                print(f"  Processing slide {i}/{len(html_files)}: {html_file.name}")
-                
-                # Validate HTML file exists and is readable
-                if not html_file.exists():
-                    print(f"  Warning: File not found, skipping: {html_file}")
-                    continue
-                
-                # Convert HTML to PDF
-                temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-                temp_pdf_path = temp_pdf.name
-                temp_files.append(temp_pdf_path)
-                
-                css = CSS(string='@page { size: 1280px 720px; margin: 0; }')
-                HTML(filename=str(html_file)).write_pdf(temp_pdf_path, stylesheets=[css])
-                
-                # Convert PDF to image
-                images = convert_from_path(temp_pdf_path, dpi=150)
-                
-                if not images:
-                    print(f"  Warning: No image generated for {html_file.name}")
-                    continue
-                
-                # Save image
-                temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                temp_img_path = temp_img.name
-                temp_files.append(temp_img_path)
-                images[0].save(temp_img_path, 'PNG')
-                
-                # Add to presentation
-                blank_slide_layout = prs.slide_layouts[6]
                 slide = prs.slides.add_slide(blank_slide_layout)
-                slide.shapes.add_picture(temp_img_path, 0, 0, width=prs.slide_width, height=prs.slide_height)
+                pictures.add_full_slide(slide, io.BytesIO(jpeg_bytes))
                 slides_created += 1
-                
             except Exception as e:
                 print(f"  Warning: Failed to process {html_file.name}: {e}")
-                continue
         
         if slides_created == 0:
+            # Surface a missing poppler through the except branch below
+            errors = [error for _, error in results if error and "poppler" in error.lower()]
+            if errors:
+                raise RuntimeError(errors[0])
             print("Error: No slides were successfully converted")
             sys.exit(1)
         
@@ -149,11 +265,3 @@ def convert_to_ppt_weasyprint(html_files: List[Path], output_path: str):
             print("\nNote: WeasyPrint PPT conversion requires poppler")
             print("Install with: brew install poppler (macOS)")
         sys.exit(1)
-    finally:
-        # Clean up temp files
-        for temp_file in temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except Exception:
-                pass
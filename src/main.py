@@ -6,11 +6,50 @@ Works on macOS, Linux, and Windows
 
 import os
 import sys
+import json
+import hashlib
+import functools
+import shutil
 import subprocess
 import platform
 from pathlib import Path
 
 
+# Directory holding main.py, converter.py and the cli package modules
+_SRC_DIR = Path(__file__).parent.resolve()
+
+# Resolved once; platform.system() shells out to uname on POSIX
+_SYSTEM = platform.system()
+
+# Memo for venv_python_exists()
+_VENV_PYTHON_EXISTS = False
+
+# Written by `setup`; lets normal runs notice changed requirements
+BOOTSTRAP_SENTINEL = Path('src/venv/.sf_bootstrap')
+
+# Runs inside the venv: installs requirements with pip in the same
+# interpreter. Only started when the sentinel is stale, so it always
+# installs: a package being importable says nothing about requirements
+# that were added or changed since the last setup.
+# argv: requirements_path [--upgrade-pip]
+BOOTSTRAP_SRC = """
+import runpy, sys
+
+print('⚙ Installing dependencies (this may take a minute)...')
+pip_args = ['install', '-r', sys.argv[1]]
+if '--upgrade-pip' in sys.argv[2:]:
+    # One resolver pass for pip itself and the requirements
+    pip_args[1:1] = ['--upgrade', 'pip']
+sys.argv = ['pip'] + pip_args
+try:
+    runpy.run_module('pip', run_name='__main__', alter_sys=True)
+except SystemExit as e:
+    if e.code:
+        raise
+print('✓ Dependencies installed successfully')
+"""
+
+
 def print_banner():
     """Print SlideForge banner."""
     banner = """
@@ -30,24 +69,6 @@ def print_banner():
     print(banner)
 
 
-def get_python_command():
-    """Get the correct Python command for the platform."""
-    # Try python3 first, then python
-    for cmd in ['python3', 'python']:
-        try:
-            result = subprocess.run(
-                [cmd, '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                return cmd
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            continue
-    return None
-
-
 def check_python_version():
     """Check if Python version is 3.7 or higher."""
     if sys.version_info < (3, 7):
@@ -67,19 +88,21 @@ def check_venv_module():
         print("⚠ venv module not found, attempting to install...")
         
         # Try to install venv
-        system = platform.system()
         try:
-            if system == 'Linux':
+            if _SYSTEM == 'Linux':
+                # PATH lookup instead of letting the spawn fail on non-apt distros
+                if not (shutil.which('sudo') and shutil.which('apt-get')):
+                    raise FileNotFoundError("apt-get not available")
                 print("  Installing python3-venv...")
                 subprocess.run(
                     ['sudo', 'apt-get', 'install', '-y', 'python3-venv'],
                     check=True
                 )
-            elif system == 'Darwin':  # macOS
+            elif _SYSTEM == 'Darwin':  # macOS
                 print("  venv should be included with Python on macOS")
                 print("  If this fails, reinstall Python from python.org")
                 return False
-            elif system == 'Windows':
+            elif _SYSTEM == 'Windows':
                 print("  venv should be included with Python on Windows")
                 print("  If this fails, reinstall Python from python.org")
                 return False
@@ -91,7 +114,7 @@ def check_venv_module():
         except Exception as e:
             print(f"❌ Failed to install venv module: {e}")
             print("\n💡 Manual installation:")
-            if system == 'Linux':
+            if _SYSTEM == 'Linux':
                 print("   sudo apt-get install python3-venv")
             else:
                 print("   Reinstall Python from https://www.python.org/downloads/")
@@ -112,44 +135,59 @@ def check_venv():
     
     print("⚙ Creating virtual environment...")
     try:
-        subprocess.run(
-            [sys.executable, '-m', 'venv', str(venv_path)],
-            check=True
-        )
+        import venv
+        venv.create(str(venv_path), with_pip=True)
         print("✓ Virtual environment created")
-        return True
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Failed to create virtual environment: {e}")
         print("\n💡 Try running manually:")
         print(f"   {sys.executable} -m venv src/venv")
         return False
+    
+    return True
 
 
+@functools.lru_cache(maxsize=1)
 def get_venv_python():
     """Get the path to Python in the virtual environment."""
-    system = platform.system()
     venv_path = Path('src/venv')
     
-    if system == 'Windows':
+    if _SYSTEM == 'Windows':
         return venv_path / 'Scripts' / 'python.exe'
     else:
         return venv_path / 'bin' / 'python'
 
 
+def venv_python_exists():
+    """Check if the venv Python exists, remembering a positive answer."""
+    # Only a hit is cached: the venv may be created later in this launch,
+    # but it never disappears during one
+    global _VENV_PYTHON_EXISTS
+    if not _VENV_PYTHON_EXISTS:
+        _VENV_PYTHON_EXISTS = get_venv_python().exists()
+    return _VENV_PYTHON_EXISTS
+
+
+def is_running_in_venv():
+    """Check if the current interpreter is the SlideForge virtual environment."""
+    # Compare prefixes, not executables: venv/bin/python is usually a symlink
+    # to the base interpreter, so resolving it would match the system Python
+    return Path(sys.prefix).resolve() == Path('src/venv').resolve()
+
+
 def get_activation_command():
     """Get the virtual environment activation command."""
-    system = platform.system()
     
-    if system == 'Windows':
+    if _SYSTEM == 'Windows':
         return 'src\\venv\\Scripts\\activate'
     else:
         return 'source src/venv/bin/activate'
 
 
-def clean_slides_directory(slides_dir: str):
+def clean_slides_directory(slides_dir: str, assume_yes: bool = False):
     """Delete all HTML files in slides directory with double confirmation."""
-    from pathlib import Path
-    import glob
+    from utils.console import is_interactive, prompt
+    from utils.file_utils import scan_html_files, delete_files
     
     slides_path = Path(slides_dir)
     
@@ -157,53 +195,60 @@ def clean_slides_directory(slides_dir: str):
         print(f"Slides directory not found: {slides_path}")
         return
     
-    # Get HTML files
-    pattern = str(slides_path / "*.html")
-    html_files = sorted(glob.glob(pattern))
+    # Get HTML files in one scandir pass; unlink takes the entry path directly
+    scanned = scan_html_files(slides_path)
+    names = [name for name, _, _ in scanned]
+    paths = [path for _, _, path in scanned]
     
-    if not html_files:
+    if not paths:
         print(f"No HTML files found in {slides_path}")
         return
     
     print(f"\n{'='*60}")
     print("⚠️  WARNING: DELETE ALL SLIDES")
     print(f"{'='*60}")
-    print(f"\nThis will permanently delete {len(html_files)} HTML file(s) from:")
+    print(f"\nThis will permanently delete {len(paths)} HTML file(s) from:")
     print(f"  {slides_path}")
     print("\nFiles to be deleted:")
-    for i, file in enumerate(html_files[:10], 1):  # Show first 10
-        print(f"  {i}. {Path(file).name}")
-    if len(html_files) > 10:
-        print(f"  ... and {len(html_files) - 10} more files")
-    
-    print(f"\n{'='*60}")
-    response1 = input("Are you sure you want to delete ALL slides? (yes/no): ").strip().lower()
-    
-    if response1 != 'yes':
-        print("Operation cancelled.")
-        return
+    preview = [f"  {i}. {name}" for i, name in enumerate(names[:10], 1)]  # Show first 10
+    sys.stdout.write("\n".join(preview) + "\n")
+    if len(paths) > 10:
+        print(f"  ... and {len(paths) - 10} more files")
     
     print(f"\n{'='*60}")
-    print("⚠️  FINAL CONFIRMATION")
-    print(f"{'='*60}")
-    response2 = input(f"Type 'DELETE' to confirm deletion of {len(html_files)} files: ").strip()
     
-    if response2 != 'DELETE':
-        print("Operation cancelled.")
-        return
+    if not assume_yes:
+        if not is_interactive():
+            print("Error: stdin is not interactive, cannot confirm deletion")
+            print("Use --yes --force-delete to delete without confirmation")
+            return
+        
+        response1 = prompt("Are you sure you want to delete ALL slides? (yes/no): ").strip().lower()
+        
+        if response1 != 'yes':
+            print("Operation cancelled.")
+            return
+        
+        print(f"\n{'='*60}")
+        print("⚠️  FINAL CONFIRMATION")
+        print(f"{'='*60}")
+        response2 = prompt(f"Type 'DELETE' to confirm deletion of {len(paths)} files: ").strip()
+        
+        if response2 != 'DELETE':
+            print("Operation cancelled.")
+            return
     
     # Delete files
-    print(f"\n🗑️  Deleting {len(html_files)} HTML files...")
-    deleted_count = 0
-    failed_count = 0
+    print(f"\n🗑️  Deleting {len(paths)} HTML files...")
     
-    for html_file in html_files:
-        try:
-            Path(html_file).unlink()
-            deleted_count += 1
-        except Exception as e:
-            print(f"  Failed to delete {Path(html_file).name}: {e}")
-            failed_count += 1
+    errors = delete_files(paths)
+    
+    # Collect failures and report them in one write after the batch
+    failures = [(name, error) for name, error in zip(names, errors) if error is not None]
+    deleted_count = len(paths) - len(failures)
+    failed_count = len(failures)
+    if failures:
+        print("\n".join(f"  Failed to delete {name}: {error}" for name, error in failures))
     
     print(f"\n✓ Deleted {deleted_count} file(s)")
     if failed_count > 0:
@@ -254,30 +299,26 @@ def run_converter(args):
                 slides_dir = args[idx + 1]
         
         # Resolve path relative to main.py location
-        script_dir = Path(__file__).parent
-        slides_path = (script_dir / slides_dir).resolve()
+        slides_path = (_SRC_DIR / slides_dir).resolve()
         
-        # List slides
-        import glob
+        # List slides (one scandir pass, sizes from the cached DirEntry)
+        from utils.file_utils import scan_html_files
         if not slides_path.exists():
             print(f"Slides directory not found: {slides_path}")
             return
         
-        pattern = str(slides_path / "*.html")
-        html_files = sorted(glob.glob(pattern))
+        slides = scan_html_files(slides_path)
         
-        if not html_files:
+        if not slides:
             print(f"No HTML files found in {slides_path}")
             return
         
         print(f"\n{'='*60}")
-        print(f"Found {len(html_files)} HTML slide(s) in {slides_path}")
+        print(f"Found {len(slides)} HTML slide(s) in {slides_path}")
         print(f"{'='*60}\n")
         
-        for i, file in enumerate(html_files, 1):
-            file_path = Path(file)
-            size = file_path.stat().st_size / 1024  # KB
-            print(f"  {i:2d}. {file_path.name:<30} ({size:.1f} KB)")
+        lines = [f"  {i:2d}. {name:<30} ({size / 1024:.1f} KB)" for i, (name, size, _) in enumerate(slides, 1)]
+        sys.stdout.write("\n".join(lines) + "\n")
         
         print(f"\n{'='*60}\n")
         return
@@ -292,26 +333,44 @@ def run_converter(args):
                 slides_dir = args[idx + 1]
         
         # Resolve path relative to main.py location
-        script_dir = Path(__file__).parent
-        slides_path = (script_dir / slides_dir).resolve()
+        slides_path = (_SRC_DIR / slides_dir).resolve()
         
-        clean_slides_directory(str(slides_path))
+        assume_yes = ('--yes' in args or '-y' in args) and '--force-delete' in args
+        clean_slides_directory(str(slides_path), assume_yes)
         return
     
     venv_python = get_venv_python()
     
-    if not venv_python.exists():
+    if not venv_python_exists():
         print("❌ Virtual environment Python not found")
         sys.exit(1)
     
     # Build command - converter.py is in same directory as main.py
-    converter_path = Path(__file__).parent / 'converter.py'
+    converter_path = _SRC_DIR / 'converter.py'
     cmd = [str(venv_python), str(converter_path)] + args
     
     print(f"\n{'='*60}")
     print("Running SlideForge...")
     print(f"{'='*60}\n")
     
+    # Already running inside the venv: call the CLI directly, no new interpreter
+    if is_running_in_venv():
+        src_dir = str(_SRC_DIR)
+        if src_dir not in sys.path:
+            sys.path.insert(0, src_dir)
+        from cli import run_converter as run_cli
+        sys.argv = [str(converter_path)] + args
+        run_cli()
+        return
+    
+    # Replace this process with the converter on POSIX (no second interpreter
+    # alive, exit code and SIGINT go straight to the converter)
+    if _SYSTEM != 'Windows':
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(str(venv_python), cmd)
+    
+    # Windows execv spawns a detached child, so keep waiting on a subprocess
     try:
         subprocess.run(cmd, check=True)
     except subprocess.CalledProcessError as e:
@@ -322,16 +381,20 @@ def run_converter(args):
         sys.exit(0)
 
 
+def get_launcher_command():
+    """Get the launcher command users should type on this platform."""
+    if _SYSTEM == 'Windows':
+        return 'slideforge.bat'
+    else:
+        return './slideforge.sh'
+
+
 def show_usage():
     """Show usage information."""
-    system = platform.system()
-    
-    if system == 'Windows':
-        cmd = 'slideforge.bat'
-    else:
-        cmd = './slideforge.sh'
+    cmd = get_launcher_command()
     
     print("\n📖 Usage:")
+    print(f"  {cmd} setup                 (first time only)")
     print(f"  {cmd} --format pdf")
     print(f"  {cmd} --format ppt")
     print(f"  {cmd} --format pdf --method weasyprint")
@@ -341,19 +404,62 @@ def show_usage():
     print()
 
 
-def install_dependencies():
-    """Install dependencies in virtual environment."""
+def get_requirements_file():
+    """Get the path to requirements.txt (root or src)."""
+    requirements_file = Path('requirements.txt')
+    if not requirements_file.exists():
+        requirements_file = Path('src/requirements.txt')
+    return requirements_file
+
+
+def get_bootstrap_key():
+    """Hash the inputs that decide whether the bootstrap must rerun."""
+    # Content rather than mtime, so a checkout or touch that leaves
+    # requirements.txt unchanged does not invalidate the setup
+    try:
+        requirements = hashlib.sha1(get_requirements_file().read_bytes()).hexdigest()
+    except OSError:
+        requirements = ''
+    
+    raw = f"{requirements}|{tuple(sys.version_info)}|{_SYSTEM}"
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def is_bootstrap_current():
+    """Check if the last setup matches the current requirements and Python."""
+    try:
+        with open(BOOTSTRAP_SENTINEL, 'r') as f:
+            sentinel = json.load(f)
+    except (OSError, ValueError):
+        return False
+    
+    return sentinel.get('key') == get_bootstrap_key()
+
+
+def write_bootstrap_sentinel():
+    """Record a successful setup for later staleness checks."""
+    try:
+        with open(BOOTSTRAP_SENTINEL, 'w') as f:
+            json.dump({'key': get_bootstrap_key()}, f)
+    except OSError:
+        pass
+
+
+def install_dependencies(upgrade_pip: bool = False):
+    """Install dependencies in virtual environment.
+    
+    upgrade_pip folds a pip self-upgrade into the same pip invocation;
+    it is only requested right after the venv is created.
+    """
     venv_python = get_venv_python()
     
     # CRITICAL: Verify venv Python exists before installing anything
-    if not venv_python.exists():
+    if not venv_python_exists():
         print("❌ Virtual environment Python not found, cannot install dependencies")
         return False
     
     # Check for requirements.txt in root or src
-    requirements_file = Path('requirements.txt')
-    if not requirements_file.exists():
-        requirements_file = Path('src/requirements.txt')
+    requirements_file = get_requirements_file()
     
     if not requirements_file.exists():
         print("⚠ requirements.txt not found, skipping dependency installation")
@@ -361,41 +467,19 @@ def install_dependencies():
     
     print("\n📦 Checking dependencies...")
     
-    # Check if dependencies are already installed
-    try:
-        result = subprocess.run(
-            [str(venv_python), '-m', 'pip', 'list'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        # Check for key packages
-        installed = result.stdout.lower()
-        if 'playwright' in installed or 'weasyprint' in installed:
-            print("✓ Dependencies already installed")
-            return True
-    except Exception:
-        pass
+    # The sentinel is only written after a successful install of exactly
+    # these requirements, so the venv probe can be skipped
+    if is_bootstrap_current():
+        print("✓ Dependencies already installed")
+        return True
+    
+    # pip runs in the venv interpreter itself, with no extra process to start it
+    cmd = [str(venv_python), '-c', BOOTSTRAP_SRC, str(requirements_file)]
+    if upgrade_pip:
+        cmd.append('--upgrade-pip')
     
-    # Install dependencies
-    print("⚙ Installing dependencies (this may take a minute)...")
     try:
-        # Upgrade pip first
-        print("  Upgrading pip...")
-        subprocess.run(
-            [str(venv_python), '-m', 'pip', 'install', '--upgrade', 'pip'],
-            capture_output=True,
-            check=True
-        )
-        
-        # Install requirements
-        print("  Installing packages...")
-        subprocess.run(
-            [str(venv_python), '-m', 'pip', 'install', '-r', str(requirements_file)],
-            check=True
-        )
-        print("✓ Dependencies installed successfully")
+        subprocess.run(cmd, check=True)
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install dependencies: {e}")
@@ -404,34 +488,64 @@ def install_dependencies():
         return False
 
 
-def main():
-    """Main entry point."""
-    print_banner()
-    
+def run_setup():
+    """Create the virtual environment and install dependencies."""
     # Check Python version
     print("\n🔍 Checking system requirements...")
     check_python_version()
     
     # Check/create virtual environment
+    venv_is_new = not Path('src/venv').exists()
     if not check_venv():
         print("\n❌ Cannot proceed without virtual environment")
         sys.exit(1)
     
-    # Install dependencies if needed
-    if not install_dependencies():
-        print("\n⚠ Warning: Dependencies may not be fully installed")
-        print("   The converter will attempt to install them when needed")
+    # Install dependencies if needed (fresh venvs also get a pip upgrade)
+    if not install_dependencies(upgrade_pip=venv_is_new):
+        print("\n❌ Setup failed: dependencies are not fully installed")
+        sys.exit(1)
+    
+    write_bootstrap_sentinel()
+    
+    print(f"\n{'='*60}")
+    print("✨ Setup complete!")
+    print(f"{'='*60}")
+    show_usage()
+
+
+def main():
+    """Main entry point."""
+    print_banner()
+    
+    # Help needs neither the venv nor the converter process
+    if '--help' in sys.argv or '-h' in sys.argv:
+        show_usage()
+        from cli import format_help
+        print(format_help())
+        sys.exit(0)
+    
+    # One-time setup: venv creation and dependency installation
+    if sys.argv[1:2] == ['setup']:
+        run_setup()
+        sys.exit(0)
+    
+    # Normal runs assume setup has been done and fail fast otherwise
+    if not venv_python_exists():
+        print("\n❌ SlideForge is not set up yet")
+        print(f"   Run: {get_launcher_command()} setup")
+        sys.exit(1)
+    
+    if not is_bootstrap_current():
+        print("\n⚠ requirements.txt or Python changed since the last setup")
+        print(f"   Run: {get_launcher_command()} setup")
     
     # Show platform info
-    print(f"✓ Platform: {platform.system()} {platform.release()}")
+    print(f"✓ Platform: {_SYSTEM} {platform.release()}")
     
     # Parse arguments
-    if len(sys.argv) == 1 or '--help' in sys.argv or '-h' in sys.argv:
+    if len(sys.argv) == 1:
         show_usage()
-        if '--help' in sys.argv or '-h' in sys.argv:
-            run_converter(['--help'])
-        else:
-            print("💡 Tip: Run with --help to see all available options")
+        print("💡 Tip: Run with --help to see all available options")
         sys.exit(0)
     
     # Get arguments (skip script name)
@@ -0,0 +1,90 @@
+"""Console helpers for interactive prompts."""
+
+import sys
+
+
+def is_interactive() -> bool:
+    """Check if stdin is a terminal that can answer prompts."""
+    try:
+        return sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def prompt(message: str) -> str:
+    """Read a line from the user, discarding keystrokes typed before the prompt."""
+    # Drop type-ahead from a slow operation so it can't answer this prompt
+    try:
+        import termios
+        termios.tcflush(sys.stdin, termios.TCIFLUSH)
+    except Exception:
+        pass  # Windows, or stdin is not a terminal
+    
+    return input(message)
+
+
+def use_block_buffered_stdout(buffer_size: int = 65536):
+    """Replace sys.stdout with a block-buffered writer, flushed at exit."""
+    import io
+    import atexit
+    
+    stdout = sys.stdout
+    stdout.flush()
+    sys.stdout = io.TextIOWrapper(
+        io.BufferedWriter(stdout.buffer, buffer_size),
+        encoding=stdout.encoding,
+        errors=stdout.errors,
+        line_buffering=False,
+    )
+    atexit.register(sys.stdout.flush)
+
+
+class LinePrefixingStdout:
+    """Stdout proxy for concurrent tasks that writes whole, tagged lines.
+    
+    A thread that called set_prefix() has its output held until a line
+    is complete, then written under lock with the prefix in front, so
+    progress from two converters never interleaves mid-line. Other
+    threads write straight through, under the same lock.
+    """
+    
+    def __init__(self, stream, lock):
+        import threading
+        
+        self._stream = stream
+        self._lock = lock
+        self._local = threading.local()
+    
+    def set_prefix(self, prefix: str):
+        """Tag every line the calling thread writes from now on."""
+        self._local.prefix = prefix
+        self._local.pending = ''
+    
+    def finish(self):
+        """Write the calling thread's unterminated text and stop tagging it."""
+        pending = getattr(self._local, 'pending', '')
+        if pending:
+            with self._lock:
+                self._stream.write(f"{self._local.prefix}{pending}\n")
+        self._local.prefix = None
+        self._local.pending = ''
+    
+    def write(self, text: str) -> int:
+        prefix = getattr(self._local, 'prefix', None)
+        if prefix is None:
+            with self._lock:
+                return self._stream.write(text)
+        
+        head, newline, self._local.pending = (self._local.pending + text).rpartition('\n')
+        if newline:
+            lines = ''.join(f"{prefix}{line}\n" if line else f"{prefix.rstrip()}\n" for line in head.split('\n'))
+            with self._lock:
+                self._stream.write(lines)
+        return len(text)
+    
+    def flush(self):
+        with self._lock:
+            self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
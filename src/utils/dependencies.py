@@ -1,13 +1,18 @@
 """Dependency management utilities."""
 
+import os
 import sys
 import subprocess
+from pathlib import Path
+
+from .console import is_interactive, prompt
 
 
 def install_package(package_name: str) -> bool:
     """Install a Python package using pip."""
     try:
         print(f"Installing {package_name}...")
+        sys.stdout.flush()  # Keep our output ahead of pip's
         subprocess.check_call([sys.executable, "-m", "pip", "install", package_name])
         return True
     except subprocess.CalledProcessError:
@@ -19,6 +24,7 @@ def install_playwright_browsers() -> bool:
     """Install Playwright browsers."""
     try:
         print("Installing Playwright Chromium browser...")
+        sys.stdout.flush()
         subprocess.check_call([sys.executable, "-m", "playwright", "install", "chromium"])
         return True
     except subprocess.CalledProcessError:
@@ -26,8 +32,88 @@ def install_playwright_browsers() -> bool:
         return False
 
 
-def check_and_install_dependencies(method: str, format: str) -> bool:
-    """Check if required dependencies are installed, and install if missing."""
+def _stamp_dir() -> Path:
+    """Get the directory holding dependency-check stamps."""
+    return Path.home() / '.slideforge'
+
+
+def _stamp_path(method: str, format: str) -> Path:
+    """Get the stamp file recording a passed check for method and format.
+    
+    The name includes a hash of this environment (prefix, interpreter and
+    site-packages), so a check that passed in one venv or checkout is
+    never reused by another Python.
+    """
+    import hashlib
+    import sysconfig
+    
+    environment = f"{sys.prefix}|{sys.executable}|{sysconfig.get_paths()['purelib']}"
+    key = hashlib.md5(environment.encode('utf-8')).hexdigest()[:16]
+    return _stamp_dir() / f'deps_{key}_{method}_{format}.ok'
+
+
+def _stamp_is_current(stamp: Path) -> bool:
+    """Check that a stamp is newer than the interpreter and its site-packages."""
+    import sysconfig
+    
+    try:
+        stamp_mtime = os.stat(stamp).st_mtime_ns
+    except OSError:
+        return False
+    
+    # pip install/uninstall touches site-packages, so a newer directory means
+    # the installed packages may have changed since the stamp was written
+    for path in (sys.executable, sysconfig.get_paths()['purelib']):
+        try:
+            if os.stat(path).st_mtime_ns > stamp_mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _write_stamp(stamp: Path):
+    """Record a passed dependency check; failures only cost a re-check later."""
+    try:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.touch()
+    except OSError:
+        pass
+
+
+def clear_dependency_stamps():
+    """Delete all dependency-check stamps so the next run re-checks."""
+    try:
+        stamps = list(_stamp_dir().glob('deps_*.ok'))
+    except OSError:
+        return
+    
+    for stamp in stamps:
+        try:
+            os.unlink(stamp)
+        except OSError:
+            pass
+
+
+def check_and_install_dependencies(method: str, format: str, assume_yes: bool = False) -> bool:
+    """Check if required dependencies are installed, and install if missing.
+    
+    A passed check is stamped per environment, method and format under
+    ~/.slideforge and skipped on later runs until the interpreter or
+    site-packages changes.
+    """
+    stamp = _stamp_path(method, format)
+    if _stamp_is_current(stamp):
+        return True
+    
+    if _check_and_install_dependencies(method, format, assume_yes):
+        _write_stamp(stamp)
+        return True
+    return False
+
+
+def _check_and_install_dependencies(method: str, format: str, assume_yes: bool) -> bool:
+    """Probe imports and offer to install whatever is missing."""
     missing_packages = []
     needs_playwright_install = False
     
@@ -42,10 +128,14 @@ def check_and_install_dependencies(method: str, format: str) -> bool:
     except ImportError:
         missing_packages.append("pillow")
     
+    # pypdf is the maintained successor; an existing PyPDF2 install still works
     try:
-        import PyPDF2
+        import pypdf
     except ImportError:
-        missing_packages.append("PyPDF2")
+        try:
+            import PyPDF2
+        except ImportError:
+            missing_packages.append("pypdf")
     
     try:
         import reportlab
@@ -104,7 +194,13 @@ def check_and_install_dependencies(method: str, format: str) -> bool:
         print("Install with: brew install poppler (macOS)")
     
     print("\n" + "="*60)
-    response = input("Would you like to install missing dependencies now? (y/n): ").strip().lower()
+    if assume_yes:
+        response = 'y'
+    elif is_interactive():
+        response = prompt("Would you like to install missing dependencies now? (y/n): ").strip().lower()
+    else:
+        print("stdin is not interactive; use --yes to install automatically.")
+        response = 'n'
     
     if response != 'y':
         print("Installation cancelled. Please install dependencies manually.")
@@ -1,36 +1,108 @@
 """File handling utilities."""
 
 import os
-import glob
+import re
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple, Union
 
+# RAM-backed scratch space, used only with room to spare: containers
+# often mount /dev/shm at 64 MB
+_SHM_DIR = '/dev/shm'
+_SHM_MIN_FREE = 256 * 1024 * 1024
 
-def get_html_files(slides_dir: str) -> List[Path]:
+
+# First run of digits in a filename, the natural sort key
+_DIGIT_RE = re.compile(r'\d+')
+
+
+def _natural_sort_key(path: str):
+    """Extract the first number from filename for natural sorting."""
+    match = _DIGIT_RE.search(os.path.basename(path))
+    if match:
+        return (int(match.group()), path)
+    return (float('inf'), path)  # Files without numbers go last
+
+
+def _is_html_entry(entry: os.DirEntry) -> bool:
+    """Check if a directory entry is a visible HTML file."""
+    # Hidden files are skipped, matching the previous glob("*.html")
+    return (
+        entry.name.endswith('.html')
+        and not entry.name.startswith('.')
+        and entry.is_file()
+    )
+
+
+def get_html_files(slides_dir: Union[str, Path]) -> List[Path]:
     """Get all HTML files from slides directory, sorted numerically."""
-    import re
+    # Single directory pass; DirEntry carries the type from readdir
+    try:
+        with os.scandir(slides_dir) as entries:
+            files = [entry.path for entry in entries if _is_html_entry(entry)]
+    except OSError:
+        return []
     
-    pattern = os.path.join(slides_dir, "*.html")
-    files = glob.glob(pattern)
+    # Sort naturally (page1, page2, ... page9, page10)
+    return [Path(f) for f in sorted(files, key=_natural_sort_key)]
+
+
+def scan_html_files(slides_dir: Union[str, Path]) -> List[Tuple[str, int, str]]:
+    """Get (name, size in bytes, path) for each HTML file, sorted like get_html_files."""
+    # DirEntry.stat() reuses the scandir result instead of a stat() per Path
+    try:
+        with os.scandir(slides_dir) as entries:
+            files = [
+                (entry.name, entry.stat(follow_symlinks=False).st_size, entry.path)
+                for entry in entries if _is_html_entry(entry)
+            ]
+    except OSError:
+        return []
     
-    def natural_sort_key(path):
-        """Extract numbers from filename for natural sorting."""
-        # Extract all numbers from the filename
-        numbers = re.findall(r'\d+', os.path.basename(path))
-        if numbers:
-            # Convert first number to int for proper sorting
-            return (int(numbers[0]), path)
-        return (float('inf'), path)  # Files without numbers go last
+    files.sort(key=lambda item: _natural_sort_key(item[2]))
+    return files
+
+
+def _safe_unlink(path) -> Optional[OSError]:
+    """Delete a file, returning the error instead of raising."""
+    try:
+        os.unlink(path)
+        return None
+    except OSError as e:
+        return e
+
+
+def delete_files(paths) -> List[Optional[OSError]]:
+    """Delete paths concurrently; returns each one's error, or None, in order."""
+    from concurrent.futures import ThreadPoolExecutor
     
-    # Sort naturally (page1, page2, ... page9, page10)
-    files_sorted = sorted(files, key=natural_sort_key)
-    return [Path(f) for f in files_sorted]
+    # unlink releases the GIL, so threads overlap the filesystem waits
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        return list(executor.map(_safe_unlink, paths))
 
 
-def create_template_slide(file_path: Path, slide_number: int):
-    """Create a template HTML slide."""
+def scratch_dir() -> Optional[str]:
+    """Directory for temp files that are written once and read straight back.
+    
+    Returns /dev/shm when it is writable and has room, so slide images
+    and partial PDFs skip the disk; None (tempfile's default) otherwise,
+    or when TMPDIR says where temp files should go.
+    """
+    if os.environ.get('TMPDIR'):
+        return None
+    
+    # Only converters need this; --list and --clean should not import shutil
+    import shutil
+    
     try:
-        template = f"""<!DOCTYPE html>
+        if os.access(_SHM_DIR, os.W_OK) and shutil.disk_usage(_SHM_DIR).free >= _SHM_MIN_FREE:
+            return _SHM_DIR
+    except OSError:
+        pass
+    return None
+
+
+# Template slide; {slide_number} is filled in, literal CSS braces are doubled
+_SLIDE_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -91,9 +163,16 @@ def create_template_slide(file_path: Path, slide_number: int):
     </div>
 </body>
 </html>"""
-    
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(template)
+
+
+def create_template_slide(file_path: Path, slide_number: int):
+    """Create a template HTML slide."""
+    try:
+        data = _SLIDE_TEMPLATE.format(slide_number=slide_number).encode('utf-8')
+        
+        # Binary mode: the bytes go straight to one write(), no text layer
+        with open(file_path, 'wb') as f:
+            f.write(data)
     except Exception as e:
         print(f"Warning: Failed to create {file_path}: {e}")
         raise
@@ -0,0 +1,129 @@
+"""PDF merging utilities."""
+
+import io
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+# A PDF on disk or already in memory (e.g. page.pdf() bytes)
+PdfSource = Union[str, Path, bytes]
+
+
+def _merge_with_qpdf(qpdf: str, pdf_files: Sequence[Union[str, Path]], output_path: Union[str, Path]) -> bool:
+    """Concatenate PDFs with qpdf, which copies page objects without re-parsing."""
+    try:
+        result = subprocess.run(
+            [qpdf, '--empty', '--pages', *map(str, pdf_files), '--', str(output_path)],
+            capture_output=True
+        )
+    except OSError:
+        return False
+    
+    # Exit status 3 means qpdf succeeded but printed warnings
+    return result.returncode in (0, 3)
+
+
+def _open_source(pdf_file: PdfSource):
+    """Return something PdfWriter.append() reads: a path string or a buffer."""
+    if isinstance(pdf_file, bytes):
+        return io.BytesIO(pdf_file)
+    return str(pdf_file)
+
+
+def _new_pdf_writer():
+    """Return an empty pypdf PdfWriter (or PyPDF2 PdfMerger)."""
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        # Older installs only have PyPDF2, whose PdfMerger has the same calls
+        from PyPDF2 import PdfMerger as PdfWriter
+    
+    return PdfWriter()
+
+
+def _write_pdf(writer, output_path: Union[str, Path]):
+    """Write writer to output_path, first sharing objects repeated across inputs."""
+    # Slides rendered one by one each embed the same fonts and images; pypdf
+    # 4.3+ can fold those copies into one (older pypdf and PyPDF2 cannot)
+    if hasattr(writer, 'compress_identical_objects'):
+        writer.compress_identical_objects()
+    
+    writer.write(str(output_path))
+    writer.close()
+
+
+def _merge_with_pypdf(pdf_files: Sequence[PdfSource], output_path: Union[str, Path], names: Sequence[str], quiet: bool) -> int:
+    """Concatenate PDFs in Python, skipping inputs that fail to load."""
+    writer = _new_pdf_writer()
+    merged = 0
+    for pdf_file, name in zip(pdf_files, names):
+        try:
+            writer.append(_open_source(pdf_file))
+            merged += 1
+        except Exception as e:
+            if not quiet:
+                print(f"  Warning: Failed to merge {name}: {e}")
+    
+    _write_pdf(writer, output_path)
+    return merged
+
+
+def merge_pdfs(pdf_files: Sequence[PdfSource], output_path: Union[str, Path], quiet: bool = False, names: Optional[List[str]] = None) -> int:
+    """Concatenate PDFs in order into output_path and return how many were merged.
+    
+    Inputs are paths or in-memory PDF bytes. Paths go through qpdf when it
+    is on PATH; otherwise (and for bytes) pypdf, or PyPDF2, does the merge.
+    names label inputs in warnings and default to the paths or "PDF n".
+    """
+    names = names or [f"PDF {i}" if isinstance(f, bytes) else str(f) for i, f in enumerate(pdf_files, 1)]
+    
+    qpdf = shutil.which('qpdf')
+    if qpdf and not any(isinstance(f, bytes) for f in pdf_files) and _merge_with_qpdf(qpdf, pdf_files, output_path):
+        return len(pdf_files)
+    
+    return _merge_with_pypdf(pdf_files, output_path, names, quiet)
+
+
+class OrderedPdfMerger:
+    """Merge numbered PDFs in index order while they arrive out of order.
+    
+    Call add() for every index from 0 up, with pdf_file None for slots that
+    have nothing to merge, then finish(). Each PDF (path or bytes) is
+    appended with pypdf as soon as all earlier ones are in, so merging
+    overlaps rendering.
+    """
+    
+    def __init__(self, quiet: bool = False):
+        self.quiet = quiet
+        self._writer = _new_pdf_writer()
+        self._pending = {}
+        self._next = 0
+        self.merged = 0
+    
+    def add(self, index: int, pdf_file: Optional[PdfSource] = None, name: Optional[str] = None):
+        """Record the PDF for index and append every PDF that is now in order."""
+        self._pending[index] = (pdf_file, name or f"PDF {index + 1}")
+        while self._next in self._pending:
+            self._take(*self._pending.pop(self._next))
+            self._next += 1
+    
+    def _take(self, pdf_file, name):
+        if pdf_file is None:
+            return
+        
+        try:
+            self._writer.append(_open_source(pdf_file))
+            self.merged += 1
+        except Exception as e:
+            if not self.quiet:
+                print(f"  Warning: Failed to merge {name}: {e}")
+    
+    def finish(self, output_path: Union[str, Path]) -> int:
+        """Write the merged PDF and return how many inputs went into it."""
+        # Indices that never arrived leave gaps; merge what is left in order
+        for index in sorted(self._pending):
+            self._take(*self._pending.pop(index))
+        
+        _write_pdf(self._writer, output_path)
+        return self.merged
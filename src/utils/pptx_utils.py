@@ -0,0 +1,76 @@
+"""PowerPoint helpers for image-per-slide decks."""
+
+from pathlib import Path
+from typing import IO, Union
+
+
+class SlidePictureAdder:
+    """Add full-slide pictures to a presentation in constant time per slide.
+    
+    python-pptx's add_picture() walks every part in the package twice per
+    call (to de-duplicate by SHA1 and to pick the next media name) and
+    opens the image to read its native size, so building an N-slide deck
+    costs O(N^2). This keeps its own SHA1 -> image part map and media
+    counter, and places the picture at the slide size without probing it.
+    Identical images (e.g. repeated backgrounds) share one embedded part,
+    and a path that was already added is not read again.
+    """
+    
+    def __init__(self, prs):
+        self.prs = prs
+        self._image_parts = {}
+        self._parts_by_path = {}
+        self._next_idx = None
+    
+    def add_full_slide(self, slide, image_file: Union[str, Path, IO[bytes]]):
+        """Add image_file (a path or file-like object) stretched over slide."""
+        try:
+            self._add(slide, str(image_file) if isinstance(image_file, Path) else image_file)
+        except (AttributeError, ImportError):
+            # python-pptx internals moved: use the public (slower) call
+            slide.shapes.add_picture(image_file, 0, 0, width=self.prs.slide_width, height=self.prs.slide_height)
+    
+    def _add(self, slide, image_file):
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        
+        image_part = self._parts_by_path.get(image_file) if isinstance(image_file, str) else None
+        if image_part is None:
+            image_part = self._get_or_add_part(image_file)
+            if isinstance(image_file, str):
+                self._parts_by_path[image_file] = image_part
+        
+        rId = slide.part.relate_to(image_part, RT.IMAGE)
+        shapes = slide.shapes
+        shape_id = shapes._next_shape_id
+        shapes._spTree.add_pic(
+            shape_id, f"Picture {shape_id - 1}", image_part.desc, rId,
+            0, 0, self.prs.slide_width, self.prs.slide_height
+        )
+    
+    def _get_or_add_part(self, image_file):
+        """Return the image part holding image_file's bytes, creating it if new."""
+        from pptx.opc.packuri import PackURI
+        from pptx.parts.image import Image, ImagePart
+        
+        image = Image.from_file(image_file)
+        image_part = self._image_parts.get(image.sha1)
+        if image_part is None:
+            package = self.prs.part.package
+            if self._next_idx is None:
+                # One scan for media already in the deck (a template's, say)
+                used = [
+                    part.partname.idx for part in package.iter_parts()
+                    if part.partname.startswith('/ppt/media/image') and part.partname.idx is not None
+                ]
+                self._next_idx = max(used, default=0) + 1
+            
+            partname = PackURI(f"/ppt/media/image{self._next_idx}.{image.ext}")
+            self._next_idx += 1
+            # Keywords: python-pptx 0.6.x takes (blob, package), 1.0 (package, blob)
+            image_part = ImagePart(
+                partname, image.content_type,
+                package=package, blob=image.blob, filename=image.filename
+            )
+            self._image_parts[image.sha1] = image_part
+        
+        return image_part